@@ -0,0 +1,87 @@
+"""Allocation and exposure breakdowns of the portfolio over time"""
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from jaskier.defaults import DEFAULT_TOP_N_HOLDINGS
+
+UNCLASSIFIED = "Unclassified"
+
+
+def read_tags(tags_file: Path) -> pd.DataFrame:
+    """Read a CSV file mapping each Symbol to any number of tag columns (e.g. asset class)."""
+    return pd.read_csv(tags_file).set_index("Symbol")
+
+
+def get_exchanges(symbols: pd.Index) -> pd.Series:
+    """Map each symbol to its exchange suffix (e.g. "AMS" for "IWDA.AMS")."""
+    symbols = pd.Series(symbols, index=symbols)
+    return (
+        symbols.str.rpartition(".")[2]
+        .where(symbols.str.contains(".", regex=False), UNCLASSIFIED)
+        .rename("Exchange")
+    )
+
+
+def get_daily_weights(performances_analysis: pd.DataFrame) -> pd.DataFrame:
+    """
+    Weight of each symbol in the portfolio valuation, per day, in one grouped reduction
+    over the per-lot daily frame. Days with a missing price are left undefined.
+    """
+    lots_values = performances_analysis["Adj cost daily"]
+    daily_values = (
+        lots_values.groupby(
+            [performances_analysis["Date Snapshot"], performances_analysis["Symbol"]]
+        )
+        .sum()
+        .unstack("Symbol", fill_value=0.0)
+    )
+    undefined_days = lots_values.isna().groupby(
+        performances_analysis["Date Snapshot"]
+    ).any()
+
+    weights = daily_values.div(daily_values.sum(axis=1), axis=0)
+    weights.loc[undefined_days.reindex(weights.index).values] = np.nan
+    return weights
+
+
+def get_grouped_weights(weights: pd.DataFrame, mapping: pd.Series) -> pd.DataFrame:
+    """Roll the symbols weights up to the groups given by mapping (indexed by symbol)."""
+    groups = weights.columns.map(mapping).fillna(UNCLASSIFIED).rename(mapping.name)
+    return weights.T.groupby(groups).sum(min_count=1).T
+
+
+def get_concentration(
+    weights: pd.DataFrame, top_n: int = DEFAULT_TOP_N_HOLDINGS
+) -> pd.DataFrame:
+    sorted_weights = -np.sort(-weights.fillna(0.0).values, axis=1)
+    concentration = pd.DataFrame(
+        {
+            "herfindahl_index": (weights ** 2).sum(axis=1, min_count=1),
+            f"top_{top_n}_weight": sorted_weights[:, :top_n].sum(axis=1),
+        },
+        index=weights.index,
+    )
+    concentration.loc[weights.isna().all(axis=1)] = np.nan
+    concentration["effective_holdings"] = 1 / concentration["herfindahl_index"]
+    return concentration
+
+
+def get_allocation_breakdowns(
+    performances_analysis: pd.DataFrame,
+    tags: pd.DataFrame = None,
+    top_n: int = DEFAULT_TOP_N_HOLDINGS,
+) -> Dict[str, pd.DataFrame]:
+    weights = get_daily_weights(performances_analysis)
+
+    breakdowns = {
+        "Symbol": weights,
+        "Exchange": get_grouped_weights(weights, get_exchanges(weights.columns)),
+    }
+    if tags is not None:
+        for tag in tags.columns:
+            breakdowns[tag] = get_grouped_weights(weights, tags[tag])
+    breakdowns["Concentration"] = get_concentration(weights, top_n=top_n)
+    return breakdowns
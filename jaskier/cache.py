@@ -0,0 +1,86 @@
+"""Content-addressed cache of the pipeline intermediate stages"""
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+from jaskier import __version__
+
+# Generate a logger
+logger = logging.getLogger(__name__)
+
+# Stages live in the financial module: any change to it invalidates the cached results
+CODE_VERSION = hashlib.sha256(
+    __version__.encode() + (Path(__file__).parent / "financial.py").read_bytes()
+).hexdigest()
+
+
+def hash_inputs(*inputs: Any) -> str:
+    """Hash the content of the given stage inputs along with the code version."""
+    digest = hashlib.sha256(CODE_VERSION.encode())
+    for value in inputs:
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(list(value.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+class StageCache():
+    """On-disk Parquet store of stage results, evicting the least recently used beyond max_size bytes."""
+
+    def __init__(self, location: Path, max_size: int) -> None:
+        self.location = Path(location)
+        self.max_size = max_size
+        self.location.mkdir(parents=True, exist_ok=True)
+
+    def get_or_compute(
+        self, stage: str, key: str, compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        df_stage = self.read(stage, key)
+        if df_stage is not None:
+            logger.log(level=logging.DEBUG, msg=f"Reusing cached stage {stage} ({key})")
+            return df_stage
+
+        df_stage = compute()
+        self.write(stage, key, df_stage)
+        return df_stage
+
+    def read(self, stage: str, key: str) -> Optional[pd.DataFrame]:
+        stage_path = self.location / f"{stage}-{key}.parquet"
+        try:
+            # Refresh the modification time which drives the LRU eviction
+            os.utime(stage_path)
+            return pd.read_parquet(stage_path)
+        except FileNotFoundError:
+            return None
+
+    def write(self, stage: str, key: str, df_stage: pd.DataFrame) -> None:
+        stage_path = self.location / f"{stage}-{key}.parquet"
+
+        # Write aside then rename so concurrent runs never read a partial file
+        tmp_path = stage_path.with_suffix(f".{os.getpid()}.tmp")
+        df_stage.to_parquet(tmp_path)
+        os.replace(tmp_path, stage_path)
+
+        self.evict()
+
+    def evict(self) -> None:
+        stage_files = []
+        for stage_path in self.location.glob("*.parquet"):
+            try:
+                stage_files.append((stage_path, stage_path.stat()))
+            except FileNotFoundError:  # Evicted meanwhile by a concurrent run
+                continue
+        stage_files.sort(key=lambda stage_file: stage_file[1].st_mtime)
+
+        total_size = sum(stat.st_size for _, stat in stage_files)
+        for stage_path, stat in stage_files:
+            if total_size <= self.max_size:
+                break
+            total_size -= stat.st_size
+            stage_path.unlink(missing_ok=True)
@@ -5,11 +5,38 @@ It can be used as a handy facility for running the task from a command line.
 from dateutil import parser as date_parser
 import logging
 from pathlib import Path
+from typing import Tuple
 import click
 
 from jaskier import __version__
-from jaskier.financial import compute_portfolio_performances
-from jaskier.renders import make_graphs
+from jaskier.allocation import get_allocation_breakdowns, read_tags
+from jaskier.financial import (
+    compute_live_portfolio_performances,
+    compute_realized_gains,
+    export_realized_gains,
+    get_global_portfolio_level_performances,
+    get_periodic_portfolio_performances,
+    run_date_to_date_analysis,
+    run_date_to_date_performances_analysis,
+    summarize_realized_gains_per_year,
+)
+from jaskier.data_quality import FILL_POLICIES
+from jaskier.defaults import (
+    DEFAULT_DRIFT_THRESHOLD,
+    DEFAULT_FILL_POLICY,
+    DEFAULT_PROJECTION_HORIZON,
+    DEFAULT_PROJECTION_PATHS,
+    DEFAULT_TOP_N_HOLDINGS,
+    REPORTING_PERIODS,
+)
+from jaskier.projection import project_portfolio_value
+from jaskier.rebalancing import (
+    get_daily_drift,
+    get_drift_breaches,
+    read_targets,
+    simulate_rebalancing,
+)
+from jaskier.renders import make_allocation_graphs, make_graphs, make_projection_graph
 from jaskier.utils import print_figlet, Context
 
 
@@ -67,9 +94,38 @@ def cli(ctx: Context, verbose: int):
     "--end", "-e", help="End date for analysis (format '1994/08/26')", type=str
 )
 @click.option("--benchmark", "-b", default="SPY", help="Benchmark for comparison.")
+@click.option(
+    "--no-cache", is_flag=True, help="Recompute every stage, ignoring cached results."
+)
+@click.option(
+    "--fill-policy",
+    type=click.Choice(FILL_POLICIES),
+    default=DEFAULT_FILL_POLICY,
+    help="How closes missing from the trading calendar are filled.",
+)
+@click.option(
+    "--period",
+    "periods",
+    multiple=True,
+    type=click.Choice(list(REPORTING_PERIODS)),
+    help="Also report performances aggregated per period (can be repeated).",
+)
+@click.option(
+    "--prices-report",
+    is_flag=True,
+    help="Report the gaps, stale repeats and outliers found in the prices of each symbol.",
+)
 @pass_context
 def run_performances_analysis(
-    ctx: Context, positions_file: str, start: str, end: str, benchmark: str
+    ctx: Context,
+    positions_file: str,
+    start: str,
+    end: str,
+    benchmark: str,
+    no_cache: bool,
+    fill_policy: str,
+    periods: Tuple[str, ...],
+    prices_report: bool,
 ) -> None:
     """
     Run a performance analysis of the portfolio defined by the positions_file CSV file between
@@ -83,18 +139,334 @@ def run_performances_analysis(
     if end is not None:
         end = date_parser.parse(end)
 
-    df_global_portfolio_performances = compute_portfolio_performances(
+    analysis = run_date_to_date_analysis(
         ctx=ctx,
         positions_tracking_file=Path(positions_file),
         start_analysis_at=start,
         end_analysis_at=end,
         benchmark=benchmark,
+        use_cache=not no_cache,
+        fill_policy=fill_policy,
     )
 
+    if prices_report:
+        click.echo(click.style("Prices quality report", bold=True))
+        click.echo(analysis["prices_report"].to_string())
+
+    df_global_portfolio_performances = get_global_portfolio_level_performances(
+        analysis["performances_analysis"], cash_flows=analysis["cash_flows"]
+    )
+
+    for period in periods:
+        df_periodic_performances = get_periodic_portfolio_performances(
+            df_global_portfolio_performances, period=period
+        )
+        click.echo(click.style(f"Performances per period ({period})", bold=True))
+        click.echo(df_periodic_performances.to_string())
+
     dashboard_figure = make_graphs(df_global_portfolio_performances)
     dashboard_figure.show()
 
 
+@cli.command()
+@click.option(
+    "--positions-file",
+    "-p",
+    required=True,
+    help="Path to files tracking positions.",
+    type=click.Path(exists=True),
+)
+@pass_context
+def run_live_valuation(ctx: Context, positions_file: str) -> None:
+    """
+    Value the portfolio defined by the positions_file CSV file at the latest available quotes,
+    on top of the holdings of the last fully defined close saved by run-performances-analysis.
+    """
+    print_figlet()
+
+    live_performances = compute_live_portfolio_performances(
+        positions_tracking_file=Path(positions_file)
+    )
+
+    for metric, value in live_performances.items():
+        click.echo(f"{metric}: {value}")
+
+
+@cli.command()
+@click.option(
+    "--positions-file",
+    "-p",
+    required=True,
+    help="Path to files tracking positions.",
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--start", "-s", help="Start date for analysis (format '1994/08/26')", type=str
+)
+@click.option(
+    "--end", "-e", help="End date for analysis (format '1994/08/26')", type=str
+)
+@click.option(
+    "--tags-file",
+    "-t",
+    help="Path to a CSV file mapping each Symbol to tag columns (e.g. asset class).",
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--top-n",
+    default=DEFAULT_TOP_N_HOLDINGS,
+    help="Number of largest holdings summed in the top-N weight.",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Recompute every stage, ignoring cached results."
+)
+@pass_context
+def run_allocation_analysis(
+    ctx: Context,
+    positions_file: str,
+    start: str,
+    end: str,
+    tags_file: str,
+    top_n: int,
+    no_cache: bool,
+) -> None:
+    """
+    Break the portfolio defined by the positions_file CSV file down by symbol, exchange and
+    tags between the start and end date, along with concentration metrics.
+    """
+    print_figlet()
+
+    if start is not None:
+        start = date_parser.parse(start)
+
+    if end is not None:
+        end = date_parser.parse(end)
+
+    performances_analysis = run_date_to_date_performances_analysis(
+        ctx=ctx,
+        positions_tracking_file=Path(positions_file),
+        start_analysis_at=start,
+        end_analysis_at=end,
+        use_cache=not no_cache,
+    )
+
+    allocation_breakdowns = get_allocation_breakdowns(
+        performances_analysis,
+        tags=read_tags(Path(tags_file)) if tags_file is not None else None,
+        top_n=top_n,
+    )
+
+    allocation_figure = make_allocation_graphs(allocation_breakdowns)
+    allocation_figure.show()
+
+
+@cli.command()
+@click.option(
+    "--positions-file",
+    "-p",
+    required=True,
+    help="Path to files tracking positions.",
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--start", "-s", help="Start date for analysis (format '1994/08/26')", type=str
+)
+@click.option(
+    "--end", "-e", help="End date for analysis (format '1994/08/26')", type=str
+)
+@click.option(
+    "--output-file",
+    "-o",
+    help="Path to export the realized gains ledger to (.csv or .parquet).",
+    type=click.Path(),
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Recompute every stage, ignoring cached results."
+)
+@pass_context
+def run_realized_gains_report(
+    ctx: Context,
+    positions_file: str,
+    start: str,
+    end: str,
+    output_file: str,
+    no_cache: bool,
+) -> None:
+    """
+    Report the gains realized by the FIFO sales of the portfolio defined by the positions_file
+    CSV file between the start and end date, summarized per year.
+    """
+    print_figlet()
+
+    if start is not None:
+        start = date_parser.parse(start)
+
+    if end is not None:
+        end = date_parser.parse(end)
+
+    ledger = compute_realized_gains(
+        ctx=ctx,
+        positions_tracking_file=Path(positions_file),
+        start_analysis_at=start,
+        end_analysis_at=end,
+        use_cache=not no_cache,
+    )
+
+    click.echo(summarize_realized_gains_per_year(ledger).to_string())
+
+    if output_file is not None:
+        export_realized_gains(ledger, Path(output_file))
+
+
+@cli.command()
+@click.option(
+    "--positions-file",
+    "-p",
+    required=True,
+    help="Path to files tracking positions.",
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--targets-file",
+    "-t",
+    required=True,
+    help="Path to a CSV file of Symbol and Target weight columns.",
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--threshold",
+    default=DEFAULT_DRIFT_THRESHOLD,
+    help="Absolute drift from a target weight flagged as a breach.",
+)
+@click.option(
+    "--rebalance",
+    type=click.Choice(["monthly", "quarterly", "yearly", "threshold"]),
+    help="Simulate rebalancing periodically or on threshold breaches.",
+)
+@click.option(
+    "--transaction-cost",
+    default=0.0,
+    help="Cost of rebalancing trades, as a fraction of the value traded.",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Recompute every stage, ignoring cached results."
+)
+@pass_context
+def run_drift_monitor(
+    ctx: Context,
+    positions_file: str,
+    targets_file: str,
+    threshold: float,
+    rebalance: str,
+    transaction_cost: float,
+    no_cache: bool,
+) -> None:
+    """
+    Monitor the drift of the portfolio defined by the positions_file CSV file from the target
+    allocation of the targets_file CSV file, and optionally simulate rebalancing it.
+    """
+    print_figlet()
+
+    performances_analysis = run_date_to_date_performances_analysis(
+        ctx=ctx,
+        positions_tracking_file=Path(positions_file),
+        use_cache=not no_cache,
+    )
+    targets = read_targets(Path(targets_file))
+
+    drift = get_daily_drift(performances_analysis, targets)
+    breaches = get_drift_breaches(drift, threshold=threshold)
+    click.echo(click.style("Current drift from targets", bold=True))
+    click.echo(drift.dropna(how="all").tail(1).T.to_string())
+    click.echo(
+        click.style(
+            f"{breaches['Date Snapshot'].nunique()} days breaching the "
+            f"{threshold:.1%} threshold",
+            bold=True,
+        )
+    )
+    click.echo(breaches.tail(10).to_string(index=False))
+
+    if rebalance is not None:
+        trades, performances = simulate_rebalancing(
+            performances_analysis,
+            targets,
+            frequency=rebalance if rebalance != "threshold" else None,
+            threshold=threshold if rebalance == "threshold" else None,
+            transaction_cost=transaction_cost,
+        )
+        click.echo(click.style(f"Rebalancing trades ({rebalance})", bold=True))
+        click.echo(trades.to_string(index=False))
+        click.echo(performances.tail(1).T.to_string())
+
+
+@cli.command()
+@click.option(
+    "--positions-file",
+    "-p",
+    required=True,
+    help="Path to files tracking positions.",
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--horizon", default=DEFAULT_PROJECTION_HORIZON, help="Trading days to project."
+)
+@click.option(
+    "--paths", default=DEFAULT_PROJECTION_PATHS, help="Number of simulated paths."
+)
+@click.option(
+    "--method",
+    type=click.Choice(["bootstrap", "normal"]),
+    default="bootstrap",
+    help="Resample historical daily returns or draw them from a fitted normal law.",
+)
+@click.option("--seed", type=int, help="Seed of the simulation, for reproducibility.")
+@click.option("--workers", default=1, help="Number of processes simulating paths.")
+@click.option(
+    "--no-cache", is_flag=True, help="Recompute every stage, ignoring cached results."
+)
+@pass_context
+def run_projection(
+    ctx: Context,
+    positions_file: str,
+    horizon: int,
+    paths: int,
+    method: str,
+    seed: int,
+    workers: int,
+    no_cache: bool,
+) -> None:
+    """
+    Project the value of the portfolio defined by the positions_file CSV file by Monte Carlo
+    simulation of the historical daily returns of its current holdings.
+    """
+    print_figlet()
+
+    analysis = run_date_to_date_analysis(
+        ctx=ctx,
+        positions_tracking_file=Path(positions_file),
+        use_cache=not no_cache,
+    )
+    performances_analysis = analysis["performances_analysis"]
+
+    df_projection_bands = project_portfolio_value(
+        performances_analysis,
+        analysis["daily_adj_close"],
+        horizon=horizon,
+        n_paths=paths,
+        method=method,
+        seed=seed,
+        workers=workers,
+    )
+    click.echo(df_projection_bands.tail(1).T.to_string())
+
+    projection_figure = make_projection_graph(
+        df_projection_bands,
+        get_global_portfolio_level_performances(performances_analysis),
+    )
+    projection_figure.show()
+
+
 @cli.command()
 @pass_context
 def version(ctx: Context):
@@ -1,6 +1,11 @@
 import datetime
-from typing import List
+import json
+import os
+from pathlib import Path
+import time
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 import requests
 
@@ -11,6 +16,7 @@ class AlphaVantageDataRetriever():
         self.api_key = api_key
         self.ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
         self.DAILY_ENDPOINT = "?function=TIME_SERIES_DAILY&symbol={symbol}&apikey={api_key}&outputsize=full"
+        self.QUOTE_ENDPOINT = "?function=GLOBAL_QUOTE&symbol={symbol}&apikey={api_key}"
 
     def get_ticker_daily(self,
                          symbols: List[str],
@@ -43,4 +49,66 @@ class AlphaVantageDataRetriever():
 
         df_symbols = df_symbols[df_symbols.index.get_level_values('Date').date >= start]
         df_symbols = df_symbols[df_symbols.index.get_level_values('Date').date <= end]
-        return df_symbols
\ No newline at end of file
+        return df_symbols
+
+    def get_latest_quotes(self, symbols: List[str]) -> pd.Series:
+        """Fetch the latest traded price of each symbol, NaN when no quote is available."""
+        quotes = {}
+        # Reuse a single connection for the whole batch of symbols
+        with requests.Session() as session:
+            for symbol in symbols:
+                parametrized_endpoint = self.QUOTE_ENDPOINT.format(symbol=symbol, api_key=self.api_key)
+                query_url = self.ALPHA_VANTAGE_URL + parametrized_endpoint
+                response = session.get(url=query_url).json()
+                quotes[symbol] = float(response.get("Global Quote", {}).get("05. price", np.nan))
+        return pd.Series(quotes, dtype=float).rename_axis("Ticker")
+
+
+class CachedQuoteRetriever():
+    """
+    Short-lived cache in front of any retriever exposing `get_latest_quotes`. When given a
+    cache_file, quotes are also persisted there so that they outlive the process.
+    """
+
+    def __init__(self, quote_source, ttl: float, cache_file: Path = None) -> None:
+        self.quote_source = quote_source
+        self.ttl = ttl
+        self.cache_file = None if cache_file is None else Path(cache_file)
+        self._quotes: Dict[str, Tuple[float, float]] = {}
+        if self.cache_file is not None and self.cache_file.exists():
+            self._quotes = {
+                symbol: tuple(quote)
+                for symbol, quote in json.loads(self.cache_file.read_text()).items()
+            }
+
+    def get_latest_quotes(self, symbols: List[str]) -> pd.Series:
+        # Wall-clock time, as persisted quotes are compared across processes
+        now = time.time()
+        stale_symbols = [
+            symbol for symbol in symbols
+            if symbol not in self._quotes or now - self._quotes[symbol][0] > self.ttl
+        ]
+
+        # Only the expired symbols are fetched, in a single batched call
+        if stale_symbols:
+            fresh_quotes = self.quote_source.get_latest_quotes(stale_symbols)
+            for symbol, price in fresh_quotes.items():
+                self._quotes[symbol] = (now, price)
+            self.save()
+
+        return pd.Series(
+            {symbol: self._quotes.get(symbol, (now, np.nan))[1] for symbol in symbols},
+            dtype=float,
+        ).rename_axis("Ticker")
+
+    def save(self) -> None:
+        if self.cache_file is None:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        # NaN quotes are written as JSON null and read back as None
+        tmp_path.write_text(json.dumps({
+            symbol: [fetched_at, None if pd.isna(price) else float(price)]
+            for symbol, (fetched_at, price) in self._quotes.items()
+        }))
+        os.replace(tmp_path, self.cache_file)
@@ -0,0 +1,80 @@
+"""Data-quality checks and repairs of the downloaded daily price series"""
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from jaskier.defaults import (
+    DEFAULT_FILL_POLICY,
+    MAX_FILLED_DAYS,
+    OUTLIER_THRESHOLD,
+    STALE_REPEATS,
+)
+
+FILL_POLICIES = ("none", "ffill", "interpolate")
+
+
+def count_consecutive(flags: pd.DataFrame) -> pd.DataFrame:
+    """Number of consecutive True values up to each row, per column."""
+    running_count = flags.cumsum()
+    return running_count - running_count.where(~flags).ffill().fillna(0)
+
+
+def validate_prices(
+    daily_prices: pd.DataFrame,
+    market_cal: List[pd.Timestamp],
+    fill_policy: str = DEFAULT_FILL_POLICY,
+    max_filled_days: int = MAX_FILLED_DAYS,
+    stale_repeats: int = STALE_REPEATS,
+    outlier_threshold: float = OUTLIER_THRESHOLD,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Align the closes of each symbol (Ticker, Date and Close columns) to the trading calendar
+    and report, per symbol, the trading days missing since its first close, the closes
+    repeated for stale_repeats days or more and the daily log-returns more than
+    outlier_threshold robust deviations away from the median.
+
+    Missing closes are then filled according to fill_policy ("none", "ffill" carrying the
+    last close forward, or "interpolate" in time), over max_filled_days days at most.
+    """
+    closes = (
+        daily_prices.groupby(["Date", "Ticker"])["Close"]
+        .last()
+        .unstack("Ticker")
+        .reindex(pd.DatetimeIndex(market_cal, name="Date"))
+    )
+
+    observed = closes.notna()
+    missing = ~observed & observed.cummax()
+
+    repeated = closes.eq(closes.shift()) & observed
+    stale = count_consecutive(repeated) >= stale_repeats
+
+    log_returns = np.log(closes.ffill()).diff().where(observed)
+    deviations = (log_returns - log_returns.median()).abs()
+    robust_deviations = deviations / (1.4826 * deviations.median())
+    outliers = robust_deviations.replace(np.inf, np.nan) > outlier_threshold
+
+    if fill_policy == "ffill":
+        filled_closes = closes.ffill(limit=max_filled_days)
+    elif fill_policy == "interpolate":
+        filled_closes = closes.interpolate(
+            method="time", limit=max_filled_days, limit_area="inside"
+        ).ffill(limit=max_filled_days)
+    else:
+        filled_closes = closes
+
+    report = pd.DataFrame(
+        {
+            "First date": closes.apply(pd.Series.first_valid_index),
+            "Last date": closes.apply(pd.Series.last_valid_index),
+            "Expected days": observed.cummax().sum(),
+            "Missing days": missing.sum(),
+            "Filled days": (missing & filled_closes.notna()).sum(),
+            "Stale days": stale.sum(),
+            "Outliers": outliers.sum(),
+        }
+    )
+
+    cleaned_prices = filled_closes.stack().rename("Close").reset_index()
+    return cleaned_prices[["Ticker", "Date", "Close"]], report
@@ -1,3 +1,31 @@
+from pathlib import Path
+
 TRADING_CALENDAR_LOCATION = "NYSE"
 TRADING_CALENDAR_FREQUENCY = "1D"
 DEFAULT_BENCHMARK = "SPY"
+LIVE_QUOTES_CACHE_TTL = 60  # seconds
+LIVE_QUOTES_CACHE_LOCATION = Path.home() / ".cache" / "jaskier" / "quotes.json"
+STAGE_CACHE_LOCATION = Path.home() / ".cache" / "jaskier" / "stages"
+STAGE_CACHE_MAX_SIZE = 512 * 1024 ** 2  # bytes
+REPORTING_PERIODS = {
+    "mtd": "M",
+    "qtd": "Q",
+    "ytd": "A",
+    "monthly": "M",
+    "quarterly": "Q",
+    "yearly": "A",
+}  #: a mapping of reporting periods to resampling frequencies
+PERIOD_TO_DATE_REPORTS = ("mtd", "qtd", "ytd")
+DEFAULT_TOP_N_HOLDINGS = 3
+MAX_PLOTTED_POINTS = 500  #: long histories are downsampled to this many points when plotted
+LONG_TERM_HOLDING_PERIOD = 365  #: days a lot must be held for its gain to be long-term
+DEFAULT_DRIFT_THRESHOLD = 0.05  #: absolute drift from a target weight
+DEFAULT_PROJECTION_HORIZON = 252  #: trading days
+DEFAULT_PROJECTION_PATHS = 10000
+PROJECTION_CHUNK_SIZE = 2000  #: paths simulated at once, bounding memory
+PROJECTION_PERCENTILES = (5, 25, 50, 75, 95)
+MIN_PROJECTION_OBSERVATIONS = 20  #: daily returns needed to project
+DEFAULT_FILL_POLICY = "ffill"  #: how closes missing from the trading calendar are filled
+MAX_FILLED_DAYS = 5  #: longest run of missing closes filled
+STALE_REPEATS = 3  #: consecutive repeats of a close flagged as stale
+OUTLIER_THRESHOLD = 10  #: robust deviations of a daily log-return flagged as outlier
@@ -2,7 +2,7 @@ from datetime import datetime
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 import pandas as pd
@@ -14,12 +14,23 @@ import pandas_market_calendars as mcal
 
 from jaskier.defaults import (
     DEFAULT_BENCHMARK,
+    DEFAULT_FILL_POLICY,
+    LIVE_QUOTES_CACHE_LOCATION,
+    LIVE_QUOTES_CACHE_TTL,
+    LONG_TERM_HOLDING_PERIOD,
+    PERIOD_TO_DATE_REPORTS,
+    REPORTING_PERIODS,
+    STAGE_CACHE_LOCATION,
+    STAGE_CACHE_MAX_SIZE,
     TRADING_CALENDAR_LOCATION,
     TRADING_CALENDAR_FREQUENCY,
 )
 
+from jaskier.cache import StageCache, hash_inputs
 from jaskier.utils import Context
-from jaskier.data_loader import AlphaVantageDataRetriever
+from jaskier.data_loader import AlphaVantageDataRetriever, CachedQuoteRetriever
+from jaskier.data_quality import validate_prices
+from jaskier.price_store import MemoryMappedPriceStore
 
 # Generate a logger
 logger = logging.getLogger(__name__)
@@ -28,6 +39,27 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
 
+# Optional local price store shared by every jaskier process of the machine
+PRICE_STORE_LOCATION = os.getenv("JASKIER_PRICE_STORE")
+
+REALIZED_GAINS_COLUMNS = [
+    "Symbol",
+    "Sale date",
+    "Lot open date",
+    "Qty",
+    "Proceeds",
+    "Cost basis",
+    "Realized gain / (Loss)",
+    "Holding period (days)",
+    "Term",
+]  #: columns of the realized gains ledger emitted by the FIFO matching
+
+# Stage holding the positions of the last close, persisted for the live valuations
+LAST_CLOSE_HOLDINGS_STAGE = "last_close_holdings"
+
+# Shared quote source, lazily created so repeated live valuations hit the cache
+_live_quote_source = None
+
 def create_market_cal(start, end):
     nyse = mcal.get_calendar(TRADING_CALENDAR_LOCATION)
     schedule = nyse.schedule(start, end)
@@ -39,8 +71,40 @@ def create_market_cal(start, end):
 
 def get_data(stocks: List[str], start: datetime.datetime, end: datetime.datetime) -> pd.DataFrame:
     av_client = AlphaVantageDataRetriever(api_key=ALPHA_VANTAGE_API_KEY)
-    data = av_client.get_ticker_daily(symbols=stocks, start=start, end=end)
-    return data
+    if PRICE_STORE_LOCATION is None:
+        data = av_client.get_ticker_daily(symbols=stocks, start=start, end=end)
+        return data
+
+    # Only the symbols missing from the shared local store are downloaded, with their
+    # whole history, then every symbol is read from the store
+    price_store = MemoryMappedPriceStore(PRICE_STORE_LOCATION)
+    stale_symbols = price_store.get_stale_symbols(list(stocks), end)
+    if stale_symbols:
+        price_store.append(
+            av_client.get_ticker_daily(
+                symbols=stale_symbols,
+                start=datetime.date.min,
+                end=datetime.date.today(),
+            )
+        )
+    return price_store.get_ticker_daily(symbols=list(stocks), start=start, end=end)
+
+
+def get_live_quote_source() -> CachedQuoteRetriever:
+    global _live_quote_source
+    if _live_quote_source is None:
+        _live_quote_source = CachedQuoteRetriever(
+            AlphaVantageDataRetriever(api_key=ALPHA_VANTAGE_API_KEY),
+            ttl=LIVE_QUOTES_CACHE_TTL,
+            cache_file=LIVE_QUOTES_CACHE_LOCATION,
+        )
+    return _live_quote_source
+
+
+def get_latest_quotes(stocks: List[str], quote_source=None) -> pd.Series:
+    if quote_source is None:
+        quote_source = get_live_quote_source()
+    return quote_source.get_latest_quotes(list(stocks))
 
 
 def get_benchmark(benchmark, start: datetime.datetime, end: datetime.datetime):
@@ -50,14 +114,38 @@ def get_benchmark(benchmark, start: datetime.datetime, end: datetime.datetime):
     return benchmark
 
 
-def position_adjust(daily_positions, sale):
+def realize_lot(position, sale, matched_qty, proceeds_per_share) -> Dict[str, Any]:
+    holding_period = (sale["Open date"] - position["Open date"]).days
+    proceeds = matched_qty * proceeds_per_share
+    cost_basis = matched_qty * position["Adj cost per share"]
+    return {
+        "Symbol": sale["Symbol"],
+        "Sale date": sale["Open date"],
+        "Lot open date": position["Open date"],
+        "Qty": matched_qty,
+        "Proceeds": proceeds,
+        "Cost basis": cost_basis,
+        "Realized gain / (Loss)": proceeds - cost_basis,
+        "Holding period (days)": holding_period,
+        "Term": "Long" if holding_period > LONG_TERM_HOLDING_PERIOD else "Short",
+    }
+
+
+def position_adjust(daily_positions, sale, realized_gains: List[Dict] = None):
     stocks_with_sales = pd.DataFrame()
     buys_before_start = daily_positions[daily_positions["Type"] == "Buy"].sort_values(
         by="Open date"
     )
+    proceeds_per_share = sale[1].get("Proceeds", np.nan) / sale[1]["Qty"]
     for position in buys_before_start[
         buys_before_start["Symbol"] == sale[1]["Symbol"]
     ].iterrows():
+        # Record the lot pair matched by the sale while quantities are adjusted
+        matched_qty = min(position[1]["Qty"], sale[1]["Qty"])
+        if realized_gains is not None and matched_qty > 0:
+            realized_gains.append(
+                realize_lot(position[1], sale[1], matched_qty, proceeds_per_share)
+            )
         if position[1]["Qty"] <= sale[1]["Qty"]:
             sale[1]["Qty"] -= position[1]["Qty"]
             position[1]["Qty"] = 0
@@ -68,21 +156,30 @@ def position_adjust(daily_positions, sale):
     return stocks_with_sales
 
 
-def portfolio_start_balance(portfolio, start_date):
-    positions_before_start = portfolio[portfolio["Open date"] <= start_date]
-    future_positions = portfolio[portfolio["Open date"] >= start_date]
+def group_sales(portfolio):
+    sale_columns = ["Qty", "Proceeds"] if "Proceeds" in portfolio.columns else ["Qty"]
     sales = (
-        positions_before_start[positions_before_start["Type"] == "Sell.FIFO"]
-        .groupby(["Symbol"])["Qty"]
-        .sum()
+        portfolio[portfolio["Type"] == "Sell.FIFO"]
+        .groupby(["Symbol", "Open date"])[sale_columns]
+        .sum(min_count=1)
     )
-    sales = sales.reset_index()
+    return sales.reset_index()
+
+
+def portfolio_start_balance(portfolio, start_date, realized_gains: List[Dict] = None):
+    # Rows dated on start_date are left to time_fill, so that they are only matched once
+    positions_before_start = portfolio[portfolio["Open date"] < start_date]
+    future_positions = portfolio[portfolio["Open date"] >= start_date]
+    sales = group_sales(positions_before_start)
     positions_no_change = positions_before_start[
         ~positions_before_start["Symbol"].isin(sales["Symbol"].unique())
     ]
     adj_positions_df = pd.DataFrame()
-    for sale in sales.iterrows():
-        adj_positions = position_adjust(positions_before_start, sale)
+    # Sales of a symbol are matched one after the other, in chronological order
+    for _, symbol_sales in sales.groupby("Symbol"):
+        adj_positions = positions_before_start
+        for sale in symbol_sales.iterrows():
+            adj_positions = position_adjust(adj_positions, sale, realized_gains)
         adj_positions_df = adj_positions_df.append(adj_positions)
     adj_positions_df = adj_positions_df.append(positions_no_change)
     adj_positions_df = adj_positions_df.append(future_positions)
@@ -90,38 +187,86 @@ def portfolio_start_balance(portfolio, start_date):
     return adj_positions_df
 
 
-def fifo(daily_positions, sales, date):
-    sales = sales[sales["Open date"] == date]
+def fifo(daily_positions, sales, date, realized_gains: List[Dict] = None):
+    sales = sales[sales["Open date"] <= date].sort_values(by="Open date")
+    future_positions = daily_positions[daily_positions["Open date"] > date]
     daily_positions = daily_positions[daily_positions["Open date"] <= date]
     positions_no_change = daily_positions[
         ~daily_positions["Symbol"].isin(sales["Symbol"].unique())
     ]
     adj_positions = pd.DataFrame()
-    for sale in sales.iterrows():
-        adj_positions = adj_positions.append(position_adjust(daily_positions, sale))
+    # Sales of a symbol are matched one after the other, in chronological order
+    for _, symbol_sales in sales.groupby("Symbol"):
+        symbol_positions = daily_positions
+        for sale in symbol_sales.iterrows():
+            symbol_positions = position_adjust(symbol_positions, sale, realized_gains)
+        adj_positions = adj_positions.append(symbol_positions)
     adj_positions = adj_positions.append(positions_no_change)
     adj_positions = adj_positions[adj_positions["Qty"] > 0]
+    adj_positions = adj_positions.append(future_positions)
     return adj_positions
 
 
-def time_fill(portfolio, market_cal):
-    sales = (
-        portfolio[portfolio["Type"] == "Sell.FIFO"]
-        .groupby(["Symbol", "Open date"])["Qty"]
-        .sum()
-    )
-    sales = sales.reset_index()
+def time_fill(portfolio, market_cal, realized_gains: List[Dict] = None):
+    pending_sales = group_sales(portfolio)
     per_day_balance = []
     for date in market_cal:
-        if (sales["Open date"] == date).any():
-            portfolio = fifo(portfolio, sales, date)
+        # Sales dated on days the calendar skips (weekends, holidays of its exchange)
+        # are matched on the next day of the calendar
+        if (pending_sales["Open date"] <= date).any():
+            portfolio = fifo(portfolio, pending_sales, date, realized_gains)
+            pending_sales = pending_sales[pending_sales["Open date"] > date]
         daily_positions = portfolio[portfolio["Open date"] <= date]
         daily_positions = daily_positions[daily_positions["Type"] == "Buy"]
         daily_positions["Date Snapshot"] = date
         per_day_balance.append(daily_positions)
+
+    if not pending_sales.empty:
+        logger.log(
+            level=logging.WARNING,
+            msg=f"{len(pending_sales)} sale(s) dated after the last day of the calendar "
+            f"({market_cal[-1]:%Y-%m-%d}) are not matched: "
+            f"{', '.join(pending_sales['Open date'].dt.strftime('%Y-%m-%d').unique())}",
+        )
     return per_day_balance
 
 
+def get_daily_cash_flows(portfolio, adj_close, market_cal) -> pd.Series:
+    """
+    Amounts invested by buys less the proceeds of sales, per day of the calendar. Sales
+    without Proceeds are valued at the last close of their date.
+    """
+    buys = portfolio[portfolio["Type"] == "Buy"]
+    sales = pd.merge_asof(
+        group_sales(portfolio).sort_values("Open date"),
+        adj_close.dropna(subset=["Close"]).sort_values("Date"),
+        left_on="Open date",
+        right_on="Date",
+        left_by="Symbol",
+        right_by="Ticker",
+    )
+    proceeds = sales["Qty"] * sales["Close"]
+    if "Proceeds" in sales.columns:
+        proceeds = sales["Proceeds"].fillna(proceeds)
+
+    flows = pd.concat(
+        [
+            pd.Series(buys["Adj cost"].values, index=buys["Open date"]),
+            pd.Series(-proceeds.values, index=sales["Open date"]),
+        ]
+    )
+    # Like sales, flows dated on days the calendar skips count on its next day
+    calendar = pd.DatetimeIndex(market_cal, name="Date Snapshot")
+    day_positions = calendar.searchsorted(flows.index)
+    flows = flows[day_positions < len(calendar)]
+    return (
+        flows.groupby(calendar[day_positions[day_positions < len(calendar)]])
+        .sum()
+        .reindex(calendar, fill_value=0.0)
+        .rename("net_cash_flow")
+    )
+
+
 # matches prices of each asset to open date, then adjusts for  cps of dates
 def modified_cost_per_share(portfolio, adj_close, start_date):
     df = pd.merge(
@@ -156,7 +301,13 @@ def benchmark_portfolio_calcs(portfolio, benchmark):
 
 
 def portfolio_end_of_year_stats(portfolio, adj_close_end):
-    adj_close_end = adj_close_end[adj_close_end["Date"] == adj_close_end["Date"].max()]
+    # Each symbol ends on its own last close, so a quote missing on the last day of the
+    # window does not drop its lots
+    adj_close_end = (
+        adj_close_end.dropna(subset=["Close"])
+        .sort_values("Date")
+        .drop_duplicates("Ticker", keep="last")
+    )
     portfolio_end_data = pd.merge(
         portfolio, adj_close_end, left_on="Symbol", right_on="Ticker"
     )
@@ -167,7 +318,9 @@ def portfolio_end_of_year_stats(portfolio, adj_close_end):
 
 # Merge the overall dataframe with the adj close start of year dataframe for YTD tracking of tickers.
 def portfolio_start_of_year_stats(portfolio, adj_close_start):
-    adj_close_start = adj_close_start[adj_close_start['Date'] == adj_close_start['Date'].min()]
+    # Each symbol starts from its own first close, so a quote missing on the first day of
+    # the window does not drop its lots
+    adj_close_start = adj_close_start.dropna(subset=['Close']).sort_values('Date').drop_duplicates('Ticker')
     portfolio_start = pd.merge(portfolio, adj_close_start[['Ticker', 'Close', 'Date']],
                                     left_on='Symbol', right_on='Ticker')
     portfolio_start.rename(columns={'Close': 'Ticker Start Date Close'}, inplace=True)
@@ -222,19 +375,108 @@ def per_day_portfolio_calcs(
     return returns
 
 
+def read_positions(positions_tracking_file: Path) -> pd.DataFrame:
+    portfolio_df = pd.read_csv(positions_tracking_file)
+    portfolio_df["Open date"] = pd.to_datetime(portfolio_df["Open date"], dayfirst=True)
+    portfolio_df["Adj cost per share"] = portfolio_df["Adj cost"] / portfolio_df["Qty"]
+    portfolio_df["Type"] = portfolio_df["Type"].str.strip()
+    return portfolio_df
+
+
+def get_stage_cache(use_cache: bool = True) -> Optional[StageCache]:
+    if not use_cache:
+        return None
+    return StageCache(location=STAGE_CACHE_LOCATION, max_size=STAGE_CACHE_MAX_SIZE)
+
+
+def run_cached_stage(
+    stage_cache: Optional[StageCache],
+    stage: str,
+    key: str,
+    compute: Callable[[], pd.DataFrame],
+) -> pd.DataFrame:
+    if stage_cache is None:
+        return compute()
+    return stage_cache.get_or_compute(stage=stage, key=key, compute=compute)
+
+
+def run_cached_stages(
+    stage_cache: Optional[StageCache],
+    stages: Tuple[str, ...],
+    key: str,
+    compute: Callable[[], Tuple[pd.DataFrame, ...]],
+) -> Tuple[pd.DataFrame, ...]:
+    """Stages computed in a single pass: all of them are recomputed if any is missing."""
+    if stage_cache is not None:
+        dfs_stages = tuple(stage_cache.read(stage, key) for stage in stages)
+        if all(df_stage is not None for df_stage in dfs_stages):
+            return dfs_stages
+
+    dfs_stages = compute()
+    if stage_cache is not None:
+        for stage, df_stage in zip(stages, dfs_stages):
+            stage_cache.write(stage, key, df_stage)
+    return dfs_stages
+
+
+def compute_per_day_holdings(
+    portfolio_df: pd.DataFrame, start_analysis_at: datetime.datetime, market_cal
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """States of positions for each day in the calendar, and the realized gains ledger."""
+    realized_gains = []
+    # Compute portfolio state at start_analysis_at
+    active_portfolio = portfolio_start_balance(
+        portfolio_df, start_analysis_at, realized_gains=realized_gains
+    )
+    positions_per_day = pd.concat(
+        time_fill(active_portfolio, market_cal, realized_gains=realized_gains), sort=True
+    )
+    return positions_per_day, get_realized_gains_ledger(realized_gains)
+
+
 def run_date_to_date_performances_analysis(
     positions_tracking_file: Path,
     start_analysis_at: datetime.datetime = None,
     end_analysis_at: datetime.datetime = None,
     ctx: Context = None,
     benchmark: str = DEFAULT_BENCHMARK,
+    use_cache: bool = True,
+    fill_policy: str = DEFAULT_FILL_POLICY,
 ) -> pd.DataFrame:
+    return run_date_to_date_analysis(
+        positions_tracking_file,
+        start_analysis_at=start_analysis_at,
+        end_analysis_at=end_analysis_at,
+        ctx=ctx,
+        benchmark=benchmark,
+        use_cache=use_cache,
+        fill_policy=fill_policy,
+    )["performances_analysis"]
+
+
+def run_date_to_date_analysis(
+    positions_tracking_file: Path,
+    start_analysis_at: datetime.datetime = None,
+    end_analysis_at: datetime.datetime = None,
+    ctx: Context = None,
+    benchmark: str = DEFAULT_BENCHMARK,
+    use_cache: bool = True,
+    fill_policy: str = DEFAULT_FILL_POLICY,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Run the whole analysis, returning the per-lot daily "performances_analysis" along with
+    the "realized_gains" ledger of the sales of the window, recorded by the FIFO matching,
+    the validated "daily_adj_close" of the symbols (Ticker, Date, Close), the daily
+    "cash_flows" invested in the portfolio and the "prices_report" of the gaps, stale
+    repeats and outliers found in the prices of each symbol and of the benchmark.
+    """
 
     # Read positions data
-    portfolio_df = pd.read_csv(positions_tracking_file)
-    portfolio_df["Open date"] = pd.to_datetime(portfolio_df["Open date"], dayfirst=True)
-    portfolio_df["Adj cost per share"] = portfolio_df["Adj cost"] / portfolio_df["Qty"]
-    portfolio_df["Type"] = portfolio_df["Type"].str.strip()
+    portfolio_df = read_positions(positions_tracking_file)
+
+    # Only an analysis over the default window, from the first position up to today, gives
+    # the holdings of the last close with their cost basis since inception
+    analysis_is_since_inception = start_analysis_at is None and end_analysis_at is None
 
     # if start_analysis_at or end_analysis_at are None, resolve values
     # based on positions mins and today's date
@@ -261,25 +503,87 @@ def run_date_to_date_performances_analysis(
 
     with yaspin(text=f"Downloading benchmark ({benchmark}) data..."):
         daily_benchmark = get_benchmark([benchmark], start_analysis_at, end_analysis_at)
-    daily_benchmark = daily_benchmark[["Date", "Close"]]
 
     with yaspin(text=f"Generating stock market trading calendar..."):
         market_cal = create_market_cal(start_analysis_at, end_analysis_at)
 
-    with yaspin(text=f"Computing portfolio's state over time..."):
-        # Compute portfolio state at start_analysis_at
-        active_portfolio = portfolio_start_balance(portfolio_df, start_analysis_at)
+    with yaspin(text=f"Validating prices against the trading calendar..."):
+        # Align every series to the calendar and fill missing closes, so that a single
+        # missing quote does not leave a whole day undefined
+        daily_adj_close, prices_report = validate_prices(
+            daily_adj_close, market_cal, fill_policy=fill_policy
+        )
+        daily_benchmark, benchmark_report = validate_prices(
+            daily_benchmark[["Ticker", "Date", "Close"]],
+            market_cal,
+            fill_policy=fill_policy,
+        )
+    daily_benchmark = daily_benchmark[["Date", "Close"]]
+    prices_report = pd.concat([prices_report, benchmark_report])
+
+    if ctx and ctx.verbose:
+        logger.log(level=logging.INFO, msg=f"Prices quality report:\n{prices_report}")
+
+    # Each stage is keyed by the content of its inputs, chained with the key of the
+    # stage it depends on, so that only the stages whose inputs changed are recomputed
+    stage_cache = get_stage_cache(use_cache)
+    per_day_holdings_key = hash_inputs(
+        portfolio_df, start_analysis_at, market_cal[:1], market_cal[-1:], len(market_cal)
+    )
+    per_day_calcs_key = hash_inputs(
+        per_day_holdings_key, daily_adj_close, daily_benchmark
+    )
 
-        # Compute the states of positions for each day in the calendar
-        positions_per_day = time_fill(active_portfolio, market_cal)
+    with yaspin(text=f"Computing portfolio's state over time..."):
+        # The realized gains are recorded while the sales are matched with the lots
+        positions_per_day, realized_gains = run_cached_stages(
+            stage_cache,
+            stages=("per_day_holdings", "realized_gains"),
+            key=per_day_holdings_key,
+            compute=lambda: compute_per_day_holdings(
+                portfolio_df, start_analysis_at, market_cal
+            ),
+        )
 
     with yaspin(text=f"Computing portfolio's performances..."):
         # Combine all results and compute performances metrics
-        combined_df = per_day_portfolio_calcs(
-            positions_per_day, daily_benchmark, daily_adj_close, start_analysis_at
+        combined_df = run_cached_stage(
+            stage_cache,
+            stage="per_day_calcs",
+            key=per_day_calcs_key,
+            compute=lambda: per_day_portfolio_calcs(
+                [positions_per_day], daily_benchmark, daily_adj_close, start_analysis_at
+            ),
         )
 
-    return combined_df
+    if analysis_is_since_inception and stage_cache is not None:
+        save_last_close_holdings(portfolio_df, get_last_fully_defined_day(combined_df))
+
+    realized_gains = realized_gains[
+        (realized_gains["Sale date"] >= pd.Timestamp(start_analysis_at))
+        & (realized_gains["Sale date"] <= pd.Timestamp(end_analysis_at))
+    ].reset_index(drop=True)
+
+    return {
+        "performances_analysis": combined_df,
+        "realized_gains": realized_gains,
+        "daily_adj_close": daily_adj_close,
+        "cash_flows": get_daily_cash_flows(portfolio_df, daily_adj_close, market_cal),
+        "prices_report": prices_report,
+    }
+
+
+def save_last_close_holdings(
+    portfolio_df: pd.DataFrame, df_last_close: pd.DataFrame
+) -> None:
+    # Keyed by the positions only, so that live valuations find it without any download
+    get_stage_cache().write(
+        LAST_CLOSE_HOLDINGS_STAGE, hash_inputs(portfolio_df), df_last_close
+    )
+
+
+def load_last_close_holdings(portfolio_df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    return get_stage_cache().read(LAST_CLOSE_HOLDINGS_STAGE, hash_inputs(portfolio_df))
 
 
 def get_last_fully_defined_day(performances_analysis: pd.DataFrame) -> pd.DataFrame:
@@ -339,14 +643,126 @@ def get_portfolio_level_performances(
         }
 
 
+def get_live_portfolio_level_performances(
+    df_performances_last_close: pd.DataFrame, quote_source=None
+) -> Dict[str, Any]:
+    """
+    Value the holdings of the last close at the latest quotes, without recomputing the
+    historical series. Symbols without a live quote are kept at their last close.
+    """
+    df_live = df_performances_last_close.copy()
+    quotes = get_latest_quotes(df_live["Symbol"].unique(), quote_source=quote_source)
+
+    df_live["Symbol Adj Close"] = (
+        df_live["Symbol"].map(quotes).fillna(df_live["Symbol Adj Close"])
+    )
+    df_live["Adj cost daily"] = df_live["Symbol Adj Close"] * df_live["Qty"]
+    df_live["Ticker Return"] = (
+        df_live["Symbol Adj Close"] / df_live["Adj cost per share"] - 1
+    )
+    df_live["Date Snapshot"] = pd.Timestamp.now()
+
+    live_performances = get_portfolio_level_performances(df_performances_d_day=df_live)
+    # The intraday P&L runs from this close, which may be several days old
+    live_performances["last_close_date"] = pd.Timestamp(
+        df_performances_last_close["Date Snapshot"].values[0]
+    )
+    live_performances["intraday_pl"] = (
+        df_live["Adj cost daily"].sum()
+        - df_performances_last_close["Adj cost daily"].sum()
+    )
+    return live_performances
+
+
 def get_global_portfolio_level_performances(
-    performances_analysis: pd.DataFrame,
+    performances_analysis: pd.DataFrame, cash_flows: pd.Series = None
 ) -> pd.DataFrame:
     results = []
     for date in performances_analysis["Date Snapshot"].unique():
         df_day = performances_analysis[performances_analysis["Date Snapshot"] == date]
         results.append(get_portfolio_level_performances(df_performances_d_day=df_day))
-    return pd.DataFrame(results).set_index("Date Snapshot")
+    df_global_portfolio_performances = pd.DataFrame(results).set_index("Date Snapshot")
+
+    if cash_flows is not None:
+        df_global_portfolio_performances["net_cash_flow"] = cash_flows.reindex(
+            df_global_portfolio_performances.index, fill_value=0.0
+        )
+    return df_global_portfolio_performances
+
+
+def get_periodic_portfolio_performances(
+    df_global_portfolio_performances: pd.DataFrame, period: str
+) -> pd.DataFrame:
+    """
+    Aggregate the daily portfolio performances per calendar period by resampling, from
+    the close preceding each period to its last close. The period P&L is the change of
+    valuation less the net cash flows ("net_cash_flow" column) invested in between, so that
+    gains realized by sales are kept. Period-to-date reports ("mtd", "qtd", "ytd") only
+    keep the current period.
+    """
+    frequency = REPORTING_PERIODS[period]
+    # Flows of days without a defined valuation still count in the period they belong to
+    cumulative_cash_flows = df_global_portfolio_performances["net_cash_flow"].cumsum()
+    df_defined = df_global_portfolio_performances.dropna(
+        subset=["current_portfolio_valuation"]
+    )
+    df_defined = df_defined.assign(
+        Date=df_defined.index, cumulative_cash_flow=cumulative_cash_flows
+    )
+
+    df_end = df_defined.resample(frequency).last().dropna(subset=["Date"])
+
+    # Each period starts from the last close of the previous one, except the first
+    # period which starts from its own first close
+    df_start = pd.concat([df_defined.iloc[[0]], df_end.iloc[:-1]]).set_axis(
+        df_end.index
+    )
+
+    df_periods = pd.DataFrame(
+        {
+            "Period start": df_start["Date"],
+            "Period end": df_end["Date"],
+            "start_portfolio_valuation": df_start["current_portfolio_valuation"],
+            "end_portfolio_valuation": df_end["current_portfolio_valuation"],
+            "net_amount_invested": df_end["cumulative_cash_flow"]
+            - df_start["cumulative_cash_flow"],
+        }
+    )
+    df_periods["period_pl"] = (
+        df_periods["end_portfolio_valuation"]
+        - df_periods["start_portfolio_valuation"]
+        - df_periods["net_amount_invested"]
+    )
+    df_periods.index = df_periods.index.to_period(frequency).rename("Period")
+    # Simple Dietz return: amounts invested during the period count for half of it
+    df_periods["period_roi"] = df_periods["period_pl"] / (
+        df_periods["start_portfolio_valuation"]
+        + df_periods["net_amount_invested"] / 2
+    ).replace(0, np.nan)
+
+    if period in PERIOD_TO_DATE_REPORTS:
+        df_periods = df_periods.tail(1)
+    return df_periods
+
+
+def get_realized_gains_ledger(realized_gains: List[Dict]) -> pd.DataFrame:
+    ledger = pd.DataFrame(realized_gains, columns=REALIZED_GAINS_COLUMNS)
+    return ledger.astype(
+        {"Sale date": "datetime64[ns]", "Lot open date": "datetime64[ns]"}
+    )
+
+
+def summarize_realized_gains_per_year(ledger: pd.DataFrame) -> pd.DataFrame:
+    return ledger.groupby([ledger["Sale date"].dt.year.rename("Year"), "Term"])[
+        ["Qty", "Proceeds", "Cost basis", "Realized gain / (Loss)"]
+    ].sum(min_count=1)
+
+
+def export_realized_gains(ledger: pd.DataFrame, output_file: Path) -> None:
+    if Path(output_file).suffix == ".parquet":
+        ledger.to_parquet(output_file, index=False)
+    else:
+        ledger.to_csv(output_file, index=False)
 
 
 def compute_portfolio_performances(
@@ -355,16 +771,60 @@ def compute_portfolio_performances(
     end_analysis_at: datetime.datetime = None,
     ctx: Context = None,
     benchmark: str = DEFAULT_BENCHMARK,
+    use_cache: bool = True,
+    fill_policy: str = DEFAULT_FILL_POLICY,
 ) -> pd.DataFrame:
 
-    performances_analysis = run_date_to_date_performances_analysis(
+    analysis = run_date_to_date_analysis(
         ctx=ctx,
         positions_tracking_file=Path(positions_tracking_file),
         start_analysis_at=start_analysis_at,
         end_analysis_at=end_analysis_at,
         benchmark=benchmark,
+        use_cache=use_cache,
+        fill_policy=fill_policy,
     )
 
     return get_global_portfolio_level_performances(
-        performances_analysis=performances_analysis
+        performances_analysis=analysis["performances_analysis"],
+        cash_flows=analysis["cash_flows"],
+    )
+
+
+def compute_live_portfolio_performances(
+    positions_tracking_file: Path,
+    quote_source=None,
+) -> Dict[str, Any]:
+    """
+    Value the holdings of the last close, persisted by the latest performances analysis of
+    the same positions, at the latest quotes: nothing but the quotes is downloaded.
+    """
+    df_last_close = load_last_close_holdings(
+        read_positions(Path(positions_tracking_file))
     )
+    if df_last_close is None:
+        raise FileNotFoundError(
+            f"No holdings of the last close found for {positions_tracking_file}: "
+            "run a performances analysis over the default window first."
+        )
+
+    return get_live_portfolio_level_performances(
+        df_performances_last_close=df_last_close, quote_source=quote_source
+    )
+
+
+def compute_realized_gains(
+    positions_tracking_file: Path,
+    start_analysis_at: datetime.datetime = None,
+    end_analysis_at: datetime.datetime = None,
+    ctx: Context = None,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+
+    return run_date_to_date_analysis(
+        ctx=ctx,
+        positions_tracking_file=Path(positions_tracking_file),
+        start_analysis_at=start_analysis_at,
+        end_analysis_at=end_analysis_at,
+        use_cache=use_cache,
+    )["realized_gains"]
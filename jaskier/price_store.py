@@ -0,0 +1,149 @@
+"""Local price history store shared by concurrent processes through memory-mapped files"""
+from contextlib import contextmanager
+import datetime
+import json
+import os
+from pathlib import Path
+import re
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where updates are left unlocked
+    fcntl = None
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+SYMBOL_UNSAFE_CHARACTERS = re.compile(r"[^\w.-]")
+
+
+class MemoryMappedPriceStore():
+    """
+    Daily prices of each symbol laid out as a datetime64[ns] dates array and a float64
+    (dates x PRICE_COLUMNS) values array, both saved as .npy files and read memory-mapped
+    so that every process shares the same page-cached copy.
+
+    An index file maps each symbol to its current files. Updates only append the dates
+    after the last stored one, into new files that the index switches to by atomic rename:
+    readers always see a complete version of each symbol.
+    """
+
+    def __init__(self, location: Path) -> None:
+        self.location = Path(location)
+        self.location.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.location / "index.json"
+
+    def read_index(self) -> Dict[str, Dict]:
+        if not self.index_path.exists():
+            return {}
+        return json.loads(self.index_path.read_text())
+
+    @contextmanager
+    def lock(self):
+        with open(self.location / ".lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_stale_symbols(self, symbols: List[str], end: datetime.date) -> List[str]:
+        """Symbols not stored yet, or stored up to before end and not refreshed today."""
+        index = self.read_index()
+        today = datetime.date.today().isoformat()
+        return [
+            symbol for symbol in symbols
+            if symbol not in index
+            or (index[symbol]["last"] < pd.Timestamp(end).date().isoformat()
+                and index[symbol]["updated"] < today)
+        ]
+
+    def read_symbol(self, symbol: str, start: datetime.date, end: datetime.date) -> pd.DataFrame:
+        # A concurrent update may remove the files listed in the index just read
+        for attempt in range(2):
+            entry = self.read_index()[symbol]
+            try:
+                dates = np.load(self.location / entry["dates"], mmap_mode="r")
+                values = np.load(self.location / entry["values"], mmap_mode="r")
+                break
+            except FileNotFoundError:
+                if attempt:
+                    raise
+
+        first = np.searchsorted(dates, np.datetime64(pd.Timestamp(start), "ns"), side="left")
+        last = np.searchsorted(dates, np.datetime64(pd.Timestamp(end), "ns"), side="right")
+
+        # Slicing the memory-mapped arrays does not copy the underlying data
+        return pd.DataFrame(
+            values[first:last],
+            index=pd.DatetimeIndex(dates[first:last], name="Date"),
+            columns=PRICE_COLUMNS,
+            copy=False,
+        )
+
+    def get_ticker_daily(self,
+                         symbols: List[str],
+                         start: datetime.date,
+                         end: datetime.date) -> pd.DataFrame:
+        """Stored prices in the same layout as AlphaVantageDataRetriever.get_ticker_daily."""
+        datas = [self.read_symbol(symbol, start, end).assign(symbol=symbol) for symbol in symbols]
+        return pd.concat(datas, keys=symbols, names=["Ticker", "Date"], sort=True)
+
+    def append(self, df_symbols: pd.DataFrame) -> None:
+        """Append the prices (indexed by Ticker and Date) dated after the last stored ones."""
+        with self.lock():
+            index = self.read_index()
+            today = datetime.date.today().isoformat()
+            obsolete_files = []
+
+            for symbol, df_symbol in df_symbols.groupby(level="Ticker"):
+                df_symbol = df_symbol.droplevel("Ticker").sort_index()
+                entry = index.get(symbol)
+
+                if entry is not None:
+                    df_symbol = df_symbol[df_symbol.index > pd.Timestamp(entry["last"])]
+                    if df_symbol.empty:
+                        entry["updated"] = today
+                        continue
+                    dates = np.concatenate([
+                        np.load(self.location / entry["dates"]),
+                        df_symbol.index.values.astype("datetime64[ns]"),
+                    ])
+                    values = np.concatenate([
+                        np.load(self.location / entry["values"]),
+                        df_symbol[PRICE_COLUMNS].values.astype(np.float64),
+                    ])
+                    obsolete_files += [entry["dates"], entry["values"]]
+                else:
+                    dates = df_symbol.index.values.astype("datetime64[ns]")
+                    values = df_symbol[PRICE_COLUMNS].values.astype(np.float64)
+
+                file_stem = f"{SYMBOL_UNSAFE_CHARACTERS.sub('_', symbol)}.{len(dates)}"
+                index[symbol] = {
+                    "dates": self.write_array(f"{file_stem}.dates.npy", dates),
+                    "values": self.write_array(f"{file_stem}.values.npy", values),
+                    "last": pd.Timestamp(dates[-1]).date().isoformat(),
+                    "updated": today,
+                }
+
+            self.write_index(index)
+
+            # Processes still mapping the obsolete files keep reading them until they close
+            for file_name in obsolete_files:
+                (self.location / file_name).unlink(missing_ok=True)
+
+    def write_array(self, file_name: str, array: np.ndarray) -> str:
+        tmp_path = self.location / f"{file_name}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as array_file:
+            np.save(array_file, np.ascontiguousarray(array))
+        os.replace(tmp_path, self.location / file_name)
+        return file_name
+
+    def write_index(self, index: Dict[str, Dict]) -> None:
+        tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(index, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,129 @@
+"""Monte Carlo projection of the portfolio value from its historical daily returns"""
+from concurrent.futures import ProcessPoolExecutor
+import datetime
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from jaskier.defaults import (
+    DEFAULT_PROJECTION_HORIZON,
+    DEFAULT_PROJECTION_PATHS,
+    MIN_PROJECTION_OBSERVATIONS,
+    PROJECTION_CHUNK_SIZE,
+    PROJECTION_PERCENTILES,
+)
+from jaskier.financial import create_market_cal, get_last_fully_defined_day
+
+
+def get_historical_returns(daily_prices: pd.DataFrame, symbols: pd.Index) -> pd.DataFrame:
+    """
+    Daily returns matrix of the symbols, from their downloaded closes (Ticker, Date, Close)
+    over the whole analysis window, whether the symbols were held or not.
+    """
+    prices = daily_prices.pivot(index="Date", columns="Ticker", values="Close")
+    returns = prices.reindex(columns=symbols).pct_change().iloc[1:].dropna()
+    if len(returns) < MIN_PROJECTION_OBSERVATIONS:
+        raise ValueError(
+            f"Only {len(returns)} daily returns of {', '.join(symbols)} are available, "
+            f"at least {MIN_PROJECTION_OBSERVATIONS} are needed to project the portfolio value."
+        )
+    return returns
+
+
+def simulate_chunk(
+    portfolio_returns: np.ndarray,
+    horizon: int,
+    n_paths: int,
+    method: str,
+    seed_sequence: np.random.SeedSequence,
+    step: int,
+) -> np.ndarray:
+    """Growth of n_paths simulated paths, every step days up to the horizon."""
+    rng = np.random.default_rng(seed_sequence)
+    if method == "bootstrap":
+        daily_returns = rng.choice(portfolio_returns, size=(n_paths, horizon))
+    else:
+        daily_returns = rng.normal(
+            portfolio_returns.mean(), portfolio_returns.std(), size=(n_paths, horizon)
+        )
+    log_growth = np.log1p(daily_returns).cumsum(axis=1)[:, step - 1::step]
+    return np.exp(log_growth).astype(np.float32)
+
+
+def simulate_paths(
+    portfolio_returns: np.ndarray,
+    horizon: int = DEFAULT_PROJECTION_HORIZON,
+    n_paths: int = DEFAULT_PROJECTION_PATHS,
+    method: str = "bootstrap",
+    seed: int = None,
+    workers: int = 1,
+    step: int = 1,
+    chunk_size: int = PROJECTION_CHUNK_SIZE,
+) -> np.ndarray:
+    """
+    Simulate the growth of n_paths paths over horizon days, by bootstrapping the historical
+    daily returns or sampling a normal distribution fitted on them. Paths are simulated by
+    chunks, each with its own seed spawned from seed, so results do not depend on workers.
+    """
+    chunks_sizes = [min(chunk_size, n_paths - first) for first in range(0, n_paths, chunk_size)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(chunks_sizes))
+    chunks_args = [
+        (portfolio_returns, horizon, size, method, seed_sequence, step)
+        for size, seed_sequence in zip(chunks_sizes, seed_sequences)
+    ]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(simulate_chunk, *zip(*chunks_args)))
+    else:
+        chunks = [simulate_chunk(*chunk_args) for chunk_args in chunks_args]
+    return np.concatenate(chunks)
+
+
+def project_portfolio_value(
+    performances_analysis: pd.DataFrame,
+    daily_prices: pd.DataFrame,
+    horizon: int = DEFAULT_PROJECTION_HORIZON,
+    n_paths: int = DEFAULT_PROJECTION_PATHS,
+    method: str = "bootstrap",
+    seed: int = None,
+    workers: int = 1,
+    step: int = 1,
+    percentiles: Sequence[int] = PROJECTION_PERCENTILES,
+) -> pd.DataFrame:
+    """Percentile bands of the projected portfolio value, per trading day of the horizon."""
+    df_last_day = get_last_fully_defined_day(performances_analysis)
+    holdings_values = df_last_day.groupby("Symbol")["Ticker Share Value"].sum()
+    current_valuation = holdings_values.sum()
+
+    # Current holdings are projected with constant weights
+    returns = get_historical_returns(daily_prices, holdings_values.index)
+    portfolio_returns = returns.values @ (holdings_values / current_valuation).values
+
+    growth = simulate_paths(
+        portfolio_returns,
+        horizon=horizon,
+        n_paths=n_paths,
+        method=method,
+        seed=seed,
+        workers=workers,
+        step=step,
+    )
+
+    # Two calendar days per trading day leave enough room for weekends and holidays
+    last_date = pd.Timestamp(df_last_day["Date Snapshot"].values[0])
+    market_cal = create_market_cal(
+        last_date + datetime.timedelta(days=1),
+        last_date + datetime.timedelta(days=2 * horizon + 10),
+    )
+    dates = pd.DatetimeIndex(market_cal[:horizon])[step - 1::step]
+    df_bands = pd.DataFrame(
+        np.percentile(growth, percentiles, axis=0).T * current_valuation,
+        index=dates,
+        columns=[f"p{percentile}" for percentile in percentiles],
+    )
+
+    # Every path starts from the current valuation
+    df_bands.loc[last_date] = current_valuation
+    return df_bands.sort_index().rename_axis("Date Snapshot")
@@ -0,0 +1,153 @@
+"""Drift of the portfolio from target allocations and simulation of rebalancing"""
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from jaskier.allocation import get_daily_weights
+from jaskier.defaults import REPORTING_PERIODS
+
+
+def read_targets(targets_file: Path) -> pd.Series:
+    """Read a CSV file of "Symbol" and "Target weight" columns, normalized to sum to 1."""
+    targets = pd.read_csv(targets_file).set_index("Symbol")["Target weight"]
+    return targets / targets.sum()
+
+
+def get_daily_drift(performances_analysis: pd.DataFrame, targets: pd.Series) -> pd.DataFrame:
+    """Daily difference between each symbol weight and its target, over the whole history."""
+    weights = get_daily_weights(performances_analysis)
+    symbols = weights.columns.union(targets.index).rename("Symbol")
+    drift = weights.reindex(columns=symbols, fill_value=0.0) - targets.reindex(
+        symbols, fill_value=0.0
+    )
+    drift.loc[weights.isna().all(axis=1)] = np.nan
+    return drift
+
+
+def get_drift_breaches(drift: pd.DataFrame, threshold: float) -> pd.DataFrame:
+    breaches = drift.where(drift.abs() > threshold).stack().rename("Drift")
+    return breaches.reset_index()
+
+
+def get_holdings_matrices(
+    performances_analysis: pd.DataFrame,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Quantities and (forward-filled) prices held per day and symbol."""
+    daily_lots = performances_analysis.groupby(["Date Snapshot", "Symbol"])
+    quantities = daily_lots["Qty"].sum().unstack("Symbol", fill_value=0.0)
+    prices = daily_lots["Symbol Adj Close"].first().unstack("Symbol").ffill()
+    return quantities, prices.reindex_like(quantities)
+
+
+def simulate_rebalancing(
+    performances_analysis: pd.DataFrame,
+    targets: pd.Series,
+    frequency: str = None,
+    threshold: float = None,
+    transaction_cost: float = 0.0,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Simulate rebalancing the portfolio to its targets on the first day of each period of the
+    given frequency ("monthly", "quarterly" or "yearly") and/or as soon as a weight drifts
+    from its target by more than threshold. Rebalancing trades are self-financed, less a
+    transaction_cost fraction of the value traded, on top of the actual positions. When the
+    actual portfolio sells more than the simulated holdings of a symbol, the portfolio is
+    rebalanced on that day rather than left short.
+
+    Between two rebalancing days the adjustments are constant, so each stretch is valued
+    in one vectorized step and the loop only runs once per rebalancing.
+
+    Returns the rebalancing trades and the daily valuation and ROI of both the actual
+    and the rebalanced portfolio.
+    """
+    quantities, prices = get_holdings_matrices(performances_analysis)
+    dates = quantities.index
+    Q = quantities.values
+    P = prices.values
+    W = targets.reindex(quantities.columns, fill_value=0.0).values
+
+    scheduled = np.zeros(len(dates), dtype=bool)
+    if frequency is not None:
+        periods = dates.to_period(REPORTING_PERIODS[frequency])
+        scheduled[1:] = periods[1:] != periods[:-1]
+
+    adjustments = np.zeros_like(Q, dtype=float)
+    costs = np.zeros(len(dates))
+    trades = []
+    adjustment = np.zeros(Q.shape[1])
+    start, rebalanced_at = 0, None
+
+    while start < len(dates):
+        holdings = Q[start:] + adjustment
+        holdings_values = np.nan_to_num(holdings * P[start:])
+        values = holdings_values.sum(axis=1)
+
+        triggers = scheduled[start:].copy()
+        if threshold is not None:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                weights = holdings_values / values[:, None]
+                triggers |= np.abs(weights - W).max(axis=1) > threshold
+        triggers |= ((holdings < 0) & ~np.isclose(holdings, 0)).any(axis=1)
+        triggers &= (values > 0) & ((~np.isnan(P[start:]) * W).sum(axis=1) > 0)
+        if rebalanced_at == start:
+            triggers[0] = False
+
+        if not triggers.any():
+            adjustments[start:] = adjustment
+            break
+
+        offset = int(np.argmax(triggers))
+        rebalanced_at = start + offset
+        adjustments[start:rebalanced_at] = adjustment
+
+        # Symbols without any price yet cannot be traded: their target is spread on the others
+        tradable_targets = np.where(np.isnan(P[rebalanced_at]), 0.0, W)
+        target_holdings = np.nan_to_num(
+            tradable_targets / tradable_targets.sum() * values[offset] / P[rebalanced_at]
+        )
+        trade = target_holdings - holdings[offset]
+        # Symbols without a price are left as they are, and float noise is not traded
+        trade[np.isnan(P[rebalanced_at]) | np.isclose(trade, 0)] = 0.0
+        traded_values = np.abs(np.nan_to_num(trade * P[rebalanced_at]))
+        costs[rebalanced_at:] += transaction_cost * traded_values.sum()
+        adjustment = adjustment + trade
+
+        for symbol_position in np.flatnonzero(trade):
+            trades.append(
+                {
+                    "Date Snapshot": dates[rebalanced_at],
+                    "Symbol": quantities.columns[symbol_position],
+                    "Qty": trade[symbol_position],
+                    "Price": P[rebalanced_at, symbol_position],
+                    "Value": trade[symbol_position] * P[rebalanced_at, symbol_position],
+                }
+            )
+        start = rebalanced_at
+
+    invested = performances_analysis.groupby("Date Snapshot")["Adj cost"].sum()
+    performances = pd.DataFrame(
+        {
+            "total_value_currently_invested": invested,
+            "current_portfolio_valuation": np.nansum(Q * P, axis=1),
+            "rebalanced_portfolio_valuation": np.nansum((Q + adjustments) * P, axis=1)
+            - costs,
+        },
+        index=dates,
+    )
+    performances["current_roi"] = (
+        performances["current_portfolio_valuation"]
+        / performances["total_value_currently_invested"]
+        - 1
+    )
+    performances["rebalanced_roi"] = (
+        performances["rebalanced_portfolio_valuation"]
+        / performances["total_value_currently_invested"]
+        - 1
+    )
+
+    df_trades = pd.DataFrame(
+        trades, columns=["Date Snapshot", "Symbol", "Qty", "Price", "Value"]
+    )
+    return df_trades, performances
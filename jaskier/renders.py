@@ -1,6 +1,17 @@
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 import pandas as pd
+from typing import Dict
+
+from jaskier.defaults import MAX_PLOTTED_POINTS
+
+
+def downsample(df: pd.DataFrame, max_points: int = MAX_PLOTTED_POINTS) -> pd.DataFrame:
+    """Keep about max_points evenly spaced rows, always including the last one."""
+    step = -(-len(df) // max_points)
+    if step <= 1:
+        return df
+    return df.iloc[sorted(set(range(0, len(df), step)) | {len(df) - 1})]
 
 
 def make_graphs(df_global_portfolio_performances: pd.DataFrame) -> go.Figure:
@@ -136,3 +147,119 @@ def make_graphs(df_global_portfolio_performances: pd.DataFrame) -> go.Figure:
     )
 
     return fig
+
+
+def make_allocation_graphs(
+    allocation_breakdowns: Dict[str, pd.DataFrame],
+    max_points: int = MAX_PLOTTED_POINTS,
+) -> go.Figure:
+
+    weights_breakdowns = {
+        name: breakdown
+        for name, breakdown in allocation_breakdowns.items()
+        if name != "Concentration"
+    }
+    df_concentration = downsample(allocation_breakdowns["Concentration"], max_points)
+
+    fig = make_subplots(
+        rows=len(weights_breakdowns) + 1,
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.05,
+        subplot_titles=[f"Weights by {name.lower()}" for name in weights_breakdowns]
+        + ["Concentration"],
+    )
+
+    for row, (name, df_weights) in enumerate(weights_breakdowns.items(), start=1):
+        df_weights = downsample(df_weights, max_points)
+        for group in df_weights.columns:
+            fig.add_trace(
+                go.Scatter(
+                    x=df_weights.index,
+                    y=df_weights[group].values,
+                    name=str(group),
+                    mode="lines",
+                    stackgroup=name,
+                    legendgroup=name,
+                ),
+                row=row,
+                col=1,
+            )
+
+    for metric in df_concentration.columns.drop("effective_holdings"):
+        fig.add_trace(
+            go.Scatter(
+                x=df_concentration.index,
+                y=df_concentration[metric].values,
+                name=metric,
+            ),
+            row=len(weights_breakdowns) + 1,
+            col=1,
+        )
+
+    fig.update_layout(
+        height=1080,
+        width=1920,
+        title_text="Portfolio allocation and exposure",
+    )
+
+    return fig
+
+
+def make_projection_graph(
+    df_projection_bands: pd.DataFrame,
+    df_global_portfolio_performances: pd.DataFrame = None,
+) -> go.Figure:
+
+    percentiles = list(df_projection_bands.columns)
+    fig = go.Figure()
+
+    if df_global_portfolio_performances is not None:
+        fig.add_trace(
+            go.Scatter(
+                x=df_global_portfolio_performances.index,
+                y=df_global_portfolio_performances["current_portfolio_valuation"].values,
+                name="Portfolio valuation",
+            )
+        )
+
+    # Nested bands, from the outermost percentiles pair to the innermost one
+    for position in range(len(percentiles) // 2):
+        lower, upper = percentiles[position], percentiles[-1 - position]
+        fig.add_trace(
+            go.Scatter(
+                x=df_projection_bands.index,
+                y=df_projection_bands[lower].values,
+                line={"width": 0},
+                showlegend=False,
+                hoverinfo="skip",
+            )
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=df_projection_bands.index,
+                y=df_projection_bands[upper].values,
+                fill="tonexty",
+                fillcolor="rgba(99, 110, 250, 0.2)",
+                line={"width": 0},
+                name=f"{lower} - {upper}",
+            )
+        )
+
+    if len(percentiles) % 2:
+        median = percentiles[len(percentiles) // 2]
+        fig.add_trace(
+            go.Scatter(
+                x=df_projection_bands.index,
+                y=df_projection_bands[median].values,
+                name=median,
+            )
+        )
+
+    fig.update_layout(
+        height=1080,
+        width=1920,
+        title_text="Projected portfolio valuation",
+    )
+
+    return fig
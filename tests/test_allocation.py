@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_allocation
+.. moduleauthor:: Nathan Derave <deravenathan@hotmail.com>
+
+This is the test module for the project's allocation module.
+"""
+import numpy as np
+import pandas as pd
+
+from jaskier.allocation import get_allocation_breakdowns
+
+
+def make_performances_analysis() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Date Snapshot": pd.to_datetime(["2022-01-03"] * 3 + ["2022-01-04"] * 3),
+            "Symbol": ["IWDA.AMS", "IWDA.AMS", "VWCE.DEX", "IWDA.AMS", "IWDA.AMS", "SPY"],
+            "Adj cost daily": [300.0, 300.0, 400.0, 300.0, np.nan, 100.0],
+        }
+    )
+
+
+def test_allocation_breakdowns():
+    """
+    Arrange: Build a per-lot daily frame, with a missing price on the second day.
+    Act: Break the allocation down by symbol, exchange and tag.
+    Assert: Lots are rolled up per group and the day with a missing price is undefined.
+    """
+    tags = pd.DataFrame({"Asset class": ["Equity"]}, index=pd.Index(["IWDA.AMS"], name="Symbol"))
+    breakdowns = get_allocation_breakdowns(make_performances_analysis(), tags=tags, top_n=1)
+
+    first_day = pd.Timestamp("2022-01-03")
+    assert breakdowns["Symbol"].loc[first_day].to_dict() == {
+        "IWDA.AMS": 0.6,
+        "SPY": 0.0,
+        "VWCE.DEX": 0.4,
+    }
+    assert breakdowns["Exchange"].loc[first_day].to_dict() == {
+        "AMS": 0.6,
+        "DEX": 0.4,
+        "Unclassified": 0.0,
+    }
+    assert breakdowns["Asset class"].loc[first_day].to_dict() == {
+        "Equity": 0.6,
+        "Unclassified": 0.4,
+    }
+    assert np.isclose(breakdowns["Concentration"].loc[first_day, "herfindahl_index"], 0.52)
+    assert breakdowns["Concentration"].loc[first_day, "top_1_weight"] == 0.6
+    assert breakdowns["Symbol"].loc[pd.Timestamp("2022-01-04")].isna().all()
+    assert breakdowns["Concentration"].loc[pd.Timestamp("2022-01-04")].isna().all()
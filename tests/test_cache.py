@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_cache
+.. moduleauthor:: Nathan Derave <deravenathan@hotmail.com>
+
+This is the test module for the project's stage cache module.
+"""
+import os
+
+import pandas as pd
+
+from jaskier.cache import StageCache, hash_inputs
+
+
+def test_hash_inputs_follows_content():
+    """
+    Arrange: Build two frames with the same content and a third one differing.
+    Act: Hash each frame.
+    Assert: Only a change of content changes the hash.
+    """
+    df = pd.DataFrame({"Symbol": ["A", "B"], "Qty": [1, 2]})
+    assert hash_inputs(df, "2021-01-01") == hash_inputs(df.copy(), "2021-01-01")
+    assert hash_inputs(df, "2021-01-01") != hash_inputs(df.assign(Qty=[1, 3]), "2021-01-01")
+    assert hash_inputs(df, "2021-01-01") != hash_inputs(df, "2021-01-02")
+
+
+def test_stage_is_computed_once(tmp_path):
+    """
+    Arrange: Create an empty stage cache.
+    Act: Request the same stage twice.
+    Assert: The stage is computed once and read back identically.
+    """
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return pd.DataFrame({"Qty": [1.0, 2.0]})
+
+    stage_cache = StageCache(location=tmp_path, max_size=10 ** 9)
+    first = stage_cache.get_or_compute(stage="stage", key="key", compute=compute)
+    second = stage_cache.get_or_compute(stage="stage", key="key", compute=compute)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_least_recently_used_stages_are_evicted(tmp_path):
+    """
+    Arrange: Store two stage results, then reuse the first one.
+    Act: Store a third stage result in a cache fitting only two of them.
+    Assert: The least recently used stage result is evicted.
+    """
+    df = pd.DataFrame({"Qty": range(100)})
+    stage_cache = StageCache(location=tmp_path, max_size=10 ** 9)
+    stage_cache.get_or_compute(stage="stage", key="first", compute=lambda: df)
+    stage_cache.get_or_compute(stage="stage", key="second", compute=lambda: df)
+    os.utime(tmp_path / "stage-first.parquet", (0, 0))
+    os.utime(tmp_path / "stage-second.parquet", (0, 0))
+    stage_cache.get_or_compute(stage="stage", key="first", compute=lambda: df)
+
+    stage_cache.max_size = 2 * (tmp_path / "stage-first.parquet").stat().st_size
+    stage_cache.get_or_compute(stage="stage", key="third", compute=lambda: df)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "stage-first.parquet",
+        "stage-third.parquet",
+    ]
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_data_loader
+.. moduleauthor:: Nathan Derave <deravenathan@hotmail.com>
+
+This is the test module for the project's data loading module.
+"""
+import pandas as pd
+
+from jaskier.data_loader import CachedQuoteRetriever
+
+
+class CountingQuoteSource():
+    """A quote source returning constant prices and recording every batch requested."""
+
+    def __init__(self):
+        self.requested = []
+
+    def get_latest_quotes(self, symbols):
+        self.requested.append(list(symbols))
+        return pd.Series({symbol: 1.0 for symbol in symbols}, dtype=float)
+
+
+def test_cached_quotes_are_reused_within_ttl():
+    """
+    Arrange: Wrap a quote source with a long-lived cache.
+    Act: Request overlapping batches of symbols.
+    Assert: Only the symbols not yet cached are fetched.
+    """
+    quote_source = CountingQuoteSource()
+    retriever = CachedQuoteRetriever(quote_source, ttl=3600)
+    retriever.get_latest_quotes(["A", "B"])
+    quotes = retriever.get_latest_quotes(["A", "B", "C"])
+    assert quote_source.requested == [["A", "B"], ["C"]]
+    assert quotes.to_dict() == {"A": 1.0, "B": 1.0, "C": 1.0}
+
+
+def test_cached_quotes_expire_after_ttl():
+    """
+    Arrange: Wrap a quote source with an already expired cache.
+    Act: Request the same symbols twice.
+    Assert: Both requests reach the quote source.
+    """
+    quote_source = CountingQuoteSource()
+    retriever = CachedQuoteRetriever(quote_source, ttl=-1)
+    retriever.get_latest_quotes(["A"])
+    retriever.get_latest_quotes(["A"])
+    assert quote_source.requested == [["A"], ["A"]]
+
+
+def test_cached_quotes_outlive_the_retriever(tmp_path):
+    """
+    Arrange: Wrap a quote source with a cache persisted to a file.
+    Act: Request the same symbols from a second retriever sharing the file.
+    Assert: The second retriever reuses the persisted quotes.
+    """
+    quote_source = CountingQuoteSource()
+    CachedQuoteRetriever(
+        quote_source, ttl=3600, cache_file=tmp_path / "quotes.json"
+    ).get_latest_quotes(["A"])
+    quotes = CachedQuoteRetriever(
+        quote_source, ttl=3600, cache_file=tmp_path / "quotes.json"
+    ).get_latest_quotes(["A"])
+    assert quote_source.requested == [["A"]]
+    assert quotes.to_dict() == {"A": 1.0}
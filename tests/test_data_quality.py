@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_data_quality
+.. moduleauthor:: Nathan Derave <deravenathan@hotmail.com>
+
+This is the test module for the project's data quality module.
+"""
+import numpy as np
+import pandas as pd
+
+from jaskier.data_quality import validate_prices
+
+
+def make_prices():
+    """Closes of a symbol over ten trading days, missing two of them and stale on three."""
+    market_cal = list(pd.bdate_range("2022-01-03", "2022-01-14"))
+    closes = [10.0, 10.5, np.nan, 11.0, 11.0, 11.0, 11.0, 11.5, 12.0, np.nan]
+    df_prices = pd.DataFrame({"Ticker": "AAA", "Date": market_cal, "Close": closes})
+    return df_prices.dropna(), market_cal
+
+
+def test_prices_report():
+    """
+    Arrange: Build closes missing from the calendar and repeated for several days.
+    Act: Validate the closes against the trading calendar.
+    Assert: Missing and stale days are reported.
+    """
+    df_prices, market_cal = make_prices()
+    _, report = validate_prices(df_prices, market_cal, fill_policy="none", stale_repeats=3)
+    assert report.loc["AAA", "Expected days"] == 10
+    assert report.loc["AAA", "Missing days"] == 2
+    assert report.loc["AAA", "Filled days"] == 0
+    assert report.loc["AAA", "Stale days"] == 1
+    assert report.loc["AAA", "Outliers"] == 0
+
+
+def test_fill_policies():
+    """
+    Arrange: Build closes missing from the calendar, inside and at the end of the series.
+    Act: Validate the closes with each fill policy.
+    Assert: Missing closes are carried forward or interpolated, or left missing.
+    """
+    df_prices, market_cal = make_prices()
+
+    cleaned, _ = validate_prices(df_prices, market_cal, fill_policy="none")
+    assert len(cleaned) == 8
+
+    cleaned, report = validate_prices(df_prices, market_cal, fill_policy="ffill")
+    assert cleaned["Close"].tolist()[2] == 10.5
+    assert cleaned["Close"].tolist()[-1] == 12.0
+    assert report.loc["AAA", "Filled days"] == 2
+
+    cleaned, _ = validate_prices(df_prices, market_cal, fill_policy="interpolate")
+    assert np.isclose(cleaned["Close"].tolist()[2], 10.75)
+    assert cleaned["Close"].tolist()[-1] == 12.0
@@ -0,0 +1,435 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_financial
+.. moduleauthor:: Nathan Derave <deravenathan@hotmail.com>
+
+This is the test module for the project's financial module.
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jaskier import financial
+from jaskier.financial import (
+    compute_live_portfolio_performances,
+    compute_portfolio_performances,
+    compute_realized_gains,
+    get_live_portfolio_level_performances,
+    get_periodic_portfolio_performances,
+    run_date_to_date_analysis,
+    run_date_to_date_performances_analysis,
+    summarize_realized_gains_per_year,
+)
+
+
+class StubQuoteSource():
+    """A quote source serving fixed prices and counting the symbols requested."""
+
+    def __init__(self, quotes):
+        self.quotes = quotes
+        self.requested = []
+
+    def get_latest_quotes(self, symbols):
+        self.requested.append(list(symbols))
+        return pd.Series(
+            {symbol: self.quotes.get(symbol, np.nan) for symbol in symbols}, dtype=float
+        )
+
+
+def make_get_data(closes):
+    """A get_data stub serving constant closes per symbol on every business day."""
+
+    def get_data(stocks, start, end):
+        datas = [
+            pd.DataFrame(
+                {"Close": closes[symbol], "Volume": 1, "symbol": symbol},
+                index=pd.bdate_range(start, end),
+            )
+            for symbol in stocks
+        ]
+        return pd.concat(datas, keys=list(stocks), names=["Ticker", "Date"])
+
+    return get_data
+
+
+def write_recent_positions(tmp_path):
+    opened_at = datetime.date.today() - datetime.timedelta(days=30)
+    positions_file = tmp_path / "positions.csv"
+    positions_file.write_text(
+        "Symbol,Qty,Type,Open date,Adj cost\n"
+        f"IWDA.AMS,10,Buy,{opened_at:%d/%m/%Y},600\n"
+        f"ESP0.DEX,20,Buy,{opened_at:%d/%m/%Y},400\n"
+    )
+    return positions_file
+
+
+def make_last_close_holdings() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Symbol": ["IWDA.AMS", "IWDA.AMS", "ESP0.DEX"],
+            "Qty": [10, 5, 20],
+            "Open date": pd.to_datetime(["2021-01-04", "2021-06-01", "2021-01-04"]),
+            "Adj cost": [500.0, 300.0, 400.0],
+            "Adj cost per share": [50.0, 60.0, 20.0],
+            "Symbol Adj Close": [70.0, 70.0, 25.0],
+            "Adj cost daily": [700.0, 350.0, 500.0],
+            "Ticker Return": [0.4, 1 / 6, 0.25],
+            "Date Snapshot": pd.Timestamp("2022-01-03"),
+        }
+    )
+
+
+def test_live_valuation_uses_latest_quotes():
+    """
+    Arrange: Build the holdings of the last close and a stub quote source.
+    Act: Compute the live portfolio performances.
+    Assert: Holdings are valued at the latest quotes, fetched in a single batch.
+    """
+    quote_source = StubQuoteSource({"IWDA.AMS": 80.0, "ESP0.DEX": 30.0})
+    live = get_live_portfolio_level_performances(
+        make_last_close_holdings(), quote_source=quote_source
+    )
+    assert len(quote_source.requested) == 1
+    assert sorted(quote_source.requested[0]) == ["ESP0.DEX", "IWDA.AMS"]
+    assert live["current_portfolio_valuation"] == 15 * 80.0 + 20 * 30.0
+    assert live["current_pl"] == 15 * 80.0 + 20 * 30.0 - 1200.0
+    assert live["intraday_pl"] == 15 * 80.0 + 20 * 30.0 - 1550.0
+    assert live["last_close_date"] == pd.Timestamp("2022-01-03")
+
+
+def test_live_valuation_falls_back_on_last_close():
+    """
+    Arrange: Build a stub quote source missing one of the held symbols.
+    Act: Compute the live portfolio performances.
+    Assert: The symbol without a quote is valued at its last close.
+    """
+    quote_source = StubQuoteSource({"IWDA.AMS": 80.0})
+    live = get_live_portfolio_level_performances(
+        make_last_close_holdings(), quote_source=quote_source
+    )
+    assert live["current_portfolio_valuation"] == 15 * 80.0 + 20 * 25.0
+
+
+def test_live_valuation_only_downloads_quotes(tmp_path, monkeypatch):
+    """
+    Arrange: Run a performances analysis up to today, then forbid any price download.
+    Act: Compute the live portfolio performances.
+    Assert: The holdings of the last close are valued at the latest quotes.
+    """
+    monkeypatch.setattr(financial, "STAGE_CACHE_LOCATION", tmp_path / "stages")
+    monkeypatch.setattr(
+        financial,
+        "get_data",
+        make_get_data({"IWDA.AMS": 70.0, "ESP0.DEX": 25.0, "SPY": 450.0}),
+    )
+    positions_file = write_recent_positions(tmp_path)
+    run_date_to_date_performances_analysis(positions_file)
+
+    def get_data(stocks, start, end):
+        raise AssertionError("Live valuations must not download prices")
+
+    monkeypatch.setattr(financial, "get_data", get_data)
+    live = compute_live_portfolio_performances(
+        positions_file,
+        quote_source=StubQuoteSource({"IWDA.AMS": 80.0, "ESP0.DEX": 30.0}),
+    )
+    assert live["current_portfolio_valuation"] == 10 * 80.0 + 20 * 30.0
+    assert live["intraday_pl"] == 10 * 10.0 + 20 * 5.0
+    assert live["last_close_date"] <= pd.Timestamp.today()
+
+
+def test_live_valuation_ignores_narrower_analyses(tmp_path, monkeypatch):
+    """
+    Arrange: Run performances analyses from a later start, and without cache.
+    Act: Compute the live portfolio performances.
+    Assert: Neither analysis saved holdings of the last close for the live valuation.
+    """
+    monkeypatch.setattr(financial, "STAGE_CACHE_LOCATION", tmp_path / "stages")
+    monkeypatch.setattr(
+        financial,
+        "get_data",
+        make_get_data({"IWDA.AMS": 70.0, "ESP0.DEX": 25.0, "SPY": 450.0}),
+    )
+    positions_file = write_recent_positions(tmp_path)
+    run_date_to_date_performances_analysis(
+        positions_file,
+        start_analysis_at=datetime.datetime.combine(
+            datetime.date.today() - datetime.timedelta(days=10), datetime.time()
+        ),
+    )
+    run_date_to_date_performances_analysis(positions_file, use_cache=False)
+
+    with pytest.raises(FileNotFoundError):
+        compute_live_portfolio_performances(
+            positions_file, quote_source=StubQuoteSource({})
+        )
+
+
+def test_live_valuation_requires_an_analysis(tmp_path, monkeypatch):
+    """
+    Arrange: Write positions never analysed.
+    Act: Compute the live portfolio performances.
+    Assert: The missing holdings of the last close are reported.
+    """
+    monkeypatch.setattr(financial, "STAGE_CACHE_LOCATION", tmp_path / "stages")
+    with pytest.raises(FileNotFoundError):
+        compute_live_portfolio_performances(
+            write_recent_positions(tmp_path), quote_source=StubQuoteSource({})
+        )
+
+
+def test_missing_first_close_keeps_lots(tmp_path, monkeypatch):
+    """
+    Arrange: Serve prices missing the first close of the window for one of the symbols.
+    Act: Run the performances analysis.
+    Assert: The lots of that symbol are kept on every day, valued from its first close.
+    """
+    monkeypatch.setattr(financial, "STAGE_CACHE_LOCATION", tmp_path / "stages")
+    all_prices = make_get_data({"IWDA.AMS": 70.0, "ESP0.DEX": 25.0, "SPY": 450.0})
+
+    def get_data(stocks, start, end):
+        df_prices = all_prices(stocks, start, end)
+        first_date = df_prices.index.get_level_values("Date").min()
+        return df_prices.drop(("ESP0.DEX", first_date), errors="ignore")
+
+    monkeypatch.setattr(financial, "get_data", get_data)
+    start_analysis_at = datetime.datetime.combine(
+        datetime.date.today() - datetime.timedelta(days=20), datetime.time()
+    )
+    performances_analysis = run_date_to_date_performances_analysis(
+        write_recent_positions(tmp_path),
+        start_analysis_at=start_analysis_at,
+        use_cache=False,
+    )
+
+    symbols_per_day = performances_analysis.groupby("Date Snapshot")["Symbol"].apply(set)
+    assert (symbols_per_day == {"IWDA.AMS", "ESP0.DEX"}).all()
+    df_esp0 = performances_analysis[performances_analysis["Symbol"] == "ESP0.DEX"]
+    assert (df_esp0["Adj cost per share"] == 25.0).all()
+
+
+def make_global_performances() -> pd.DataFrame:
+    dates = pd.bdate_range("2021-11-29", "2022-01-05", name="Date Snapshot")
+    invested = np.where(dates >= "2022-01-03", 2000.0, 1000.0)
+    valuation = invested + np.arange(len(dates), dtype=float)
+    return pd.DataFrame(
+        {
+            "total_value_currently_invested": invested,
+            "current_portfolio_valuation": valuation,
+            "current_pl": valuation - invested,
+            "net_cash_flow": np.where(dates == "2022-01-03", 1000.0, 0.0),
+        },
+        index=dates,
+    )
+
+
+def test_periodic_performances_per_calendar_year():
+    """
+    Arrange: Build daily portfolio performances spanning two calendar years.
+    Act: Aggregate the performances per year.
+    Assert: Each year runs from the previous year's last close to its own last close.
+    """
+    df_periods = get_periodic_portfolio_performances(
+        make_global_performances(), period="yearly"
+    )
+    assert [str(period) for period in df_periods.index] == ["2021", "2022"]
+    assert df_periods["Period start"].tolist() == pd.to_datetime(
+        ["2021-11-29", "2021-12-31"]
+    ).tolist()
+    assert df_periods["period_pl"].tolist() == [24.0, 3.0]
+    assert df_periods["net_amount_invested"].tolist() == [0.0, 1000.0]
+    assert df_periods["period_roi"].iloc[1] == 3.0 / (1024.0 + 500.0)
+
+
+def test_period_to_date_performances_keep_current_period():
+    """
+    Arrange: Build daily portfolio performances spanning two months.
+    Act: Aggregate the month-to-date performances.
+    Assert: Only the current month is reported.
+    """
+    df_periods = get_periodic_portfolio_performances(
+        make_global_performances(), period="mtd"
+    )
+    assert [str(period) for period in df_periods.index] == ["2022-01"]
+
+
+def test_realized_gains_ledger_matches_lots_fifo(tmp_path, monkeypatch):
+    """
+    Arrange: Write positions with two sales, the second one spanning two lots.
+    Act: Compute the realized gains ledger.
+    Assert: Each sale is matched with the oldest lots and its proceeds split pro rata.
+    """
+    monkeypatch.setattr(financial, "STAGE_CACHE_LOCATION", tmp_path / "stages")
+    monkeypatch.setattr(
+        financial, "get_data", make_get_data({"IWDA.AMS": 70.0, "SPY": 450.0})
+    )
+    positions_file = tmp_path / "positions.csv"
+    positions_file.write_text(
+        "Symbol,Qty,Type,Open date,Adj cost,Proceeds\n"
+        "IWDA.AMS,10,Buy,04/01/2021,600,\n"
+        "IWDA.AMS,10,Buy,01/03/2021,650,\n"
+        "IWDA.AMS,5,Sell.FIFO,01/06/2021,0,375\n"
+        "IWDA.AMS,10,Sell.FIFO,04/04/2022,0,800\n"
+    )
+    ledger = compute_realized_gains(
+        positions_file, end_analysis_at=datetime.datetime(2022, 6, 1)
+    )
+    # The ledger is cached along with the holdings it was recorded with
+    cached_ledger = compute_realized_gains(
+        positions_file, end_analysis_at=datetime.datetime(2022, 6, 1)
+    )
+    pd.testing.assert_frame_equal(cached_ledger, ledger)
+    assert list((tmp_path / "stages").glob("realized_gains-*.parquet"))
+    assert ledger["Lot open date"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2021-01-04",
+        "2021-01-04",
+        "2021-03-01",
+    ]
+    assert ledger["Qty"].tolist() == [5, 5, 5]
+    assert ledger["Proceeds"].tolist() == [375.0, 400.0, 400.0]
+    assert ledger["Realized gain / (Loss)"].tolist() == [75.0, 100.0, 75.0]
+    assert ledger["Term"].tolist() == ["Short", "Long", "Long"]
+
+    summary = summarize_realized_gains_per_year(ledger)
+    assert summary.loc[(2022, "Long"), "Realized gain / (Loss)"] == 175.0
+
+
+def test_sale_on_start_date_is_realized_once(tmp_path, monkeypatch):
+    """
+    Arrange: Write positions with a sale dated on the start of the analysis.
+    Act: Compute the realized gains ledger from that start.
+    Assert: The sale is matched once, and the next sale with the remaining lots.
+    """
+    monkeypatch.setattr(financial, "STAGE_CACHE_LOCATION", tmp_path / "stages")
+    monkeypatch.setattr(
+        financial, "get_data", make_get_data({"IWDA.AMS": 70.0, "SPY": 450.0})
+    )
+    positions_file = tmp_path / "positions.csv"
+    positions_file.write_text(
+        "Symbol,Qty,Type,Open date,Adj cost,Proceeds\n"
+        "IWDA.AMS,10,Buy,04/01/2022,600,\n"
+        "IWDA.AMS,10,Buy,01/03/2022,650,\n"
+        "IWDA.AMS,5,Sell.FIFO,01/04/2022,0,375\n"
+        "IWDA.AMS,10,Sell.FIFO,04/04/2022,0,800\n"
+    )
+    ledger = compute_realized_gains(
+        positions_file,
+        start_analysis_at=datetime.datetime(2022, 4, 1),
+        end_analysis_at=datetime.datetime(2022, 4, 8),
+    )
+    assert ledger["Sale date"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2022-04-01",
+        "2022-04-04",
+        "2022-04-04",
+    ]
+    assert ledger["Lot open date"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2022-01-04",
+        "2022-01-04",
+        "2022-03-01",
+    ]
+    assert ledger["Qty"].tolist() == [5, 5, 5]
+
+
+def test_sale_on_a_closed_market_day_is_realized(tmp_path, monkeypatch):
+    """
+    Arrange: Write positions with a sale dated on a Saturday.
+    Act: Run the analysis and compute the realized gains ledger.
+    Assert: The sale is recorded at its own date and applied on the next trading day.
+    """
+    monkeypatch.setattr(financial, "STAGE_CACHE_LOCATION", tmp_path / "stages")
+    monkeypatch.setattr(
+        financial, "get_data", make_get_data({"IWDA.AMS": 70.0, "SPY": 450.0})
+    )
+    positions_file = tmp_path / "positions.csv"
+    positions_file.write_text(
+        "Symbol,Qty,Type,Open date,Adj cost,Proceeds\n"
+        "IWDA.AMS,10,Buy,04/01/2022,600,\n"
+        "IWDA.AMS,4,Sell.FIFO,02/04/2022,0,300\n"
+    )
+    analysis = run_date_to_date_analysis(
+        positions_file,
+        start_analysis_at=datetime.datetime(2022, 3, 25),
+        end_analysis_at=datetime.datetime(2022, 4, 8),
+        use_cache=False,
+    )
+    ledger = analysis["realized_gains"]
+    assert ledger["Sale date"].dt.strftime("%Y-%m-%d").tolist() == ["2022-04-02"]
+    assert ledger["Realized gain / (Loss)"].tolist() == [60.0]
+
+    daily_qty = analysis["performances_analysis"].groupby("Date Snapshot")["Qty"].sum()
+    assert daily_qty["2022-04-01"] == 10
+    assert daily_qty["2022-04-04"] == 6
+
+
+def test_periodic_performances_keep_realized_gains(tmp_path, monkeypatch):
+    """
+    Arrange: Write positions bought at 50, doubling in February, half sold in March.
+    Act: Aggregate the portfolio performances per month.
+    Assert: The sale does not show as a loss: March is flat.
+    """
+    monkeypatch.setattr(financial, "STAGE_CACHE_LOCATION", tmp_path / "stages")
+    all_prices = make_get_data({"IWDA.AMS": 50.0, "SPY": 450.0})
+
+    def get_data(stocks, start, end):
+        df_prices = all_prices(stocks, start, end)
+        doubled = (df_prices.index.get_level_values("Ticker") == "IWDA.AMS") & (
+            df_prices.index.get_level_values("Date") >= "2022-02-01"
+        )
+        df_prices.loc[doubled, "Close"] = 100.0
+        return df_prices
+
+    monkeypatch.setattr(financial, "get_data", get_data)
+    positions_file = tmp_path / "positions.csv"
+    positions_file.write_text(
+        "Symbol,Qty,Type,Open date,Adj cost\n"
+        "IWDA.AMS,10,Buy,10/01/2022,500\n"
+        "IWDA.AMS,5,Sell.FIFO,15/03/2022,0\n"
+    )
+    df_global = compute_portfolio_performances(
+        positions_file,
+        start_analysis_at=datetime.datetime(2022, 1, 7),
+        end_analysis_at=datetime.datetime(2022, 3, 31),
+        use_cache=False,
+    )
+
+    df_periods = get_periodic_portfolio_performances(df_global, period="monthly")
+    assert [str(period) for period in df_periods.index] == ["2022-01", "2022-02", "2022-03"]
+    assert df_periods["period_pl"].tolist() == [0.0, 500.0, 0.0]
+    assert df_periods["net_amount_invested"].tolist() == [0.0, 0.0, -500.0]
+    assert df_periods["period_roi"].tolist() == [0.0, 1.0, 0.0]
+
+
+def test_analysis_reports_prices_quality(tmp_path, monkeypatch):
+    """
+    Arrange: Serve prices missing a close in the middle of the window for one symbol.
+    Act: Run the analysis.
+    Assert: The prices report covers every symbol and the benchmark, with the gap.
+    """
+    monkeypatch.setattr(financial, "STAGE_CACHE_LOCATION", tmp_path / "stages")
+    all_prices = make_get_data({"IWDA.AMS": 70.0, "ESP0.DEX": 25.0, "SPY": 450.0})
+
+    def get_data(stocks, start, end):
+        df_prices = all_prices(stocks, start, end)
+        return df_prices.drop(("ESP0.DEX", pd.Timestamp("2022-04-06")), errors="ignore")
+
+    monkeypatch.setattr(financial, "get_data", get_data)
+    positions_file = tmp_path / "positions.csv"
+    positions_file.write_text(
+        "Symbol,Qty,Type,Open date,Adj cost\n"
+        "IWDA.AMS,10,Buy,01/03/2022,600\n"
+        "ESP0.DEX,20,Buy,01/03/2022,400\n"
+    )
+    analysis = run_date_to_date_analysis(
+        positions_file,
+        start_analysis_at=datetime.datetime(2022, 4, 1),
+        end_analysis_at=datetime.datetime(2022, 4, 8),
+        use_cache=False,
+    )
+    prices_report = analysis["prices_report"]
+    assert sorted(prices_report.index) == ["ESP0.DEX", "IWDA.AMS", "SPY"]
+    assert prices_report.loc["ESP0.DEX", "Missing days"] == 1
+    assert prices_report.loc["SPY", "Missing days"] == 0
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_price_store
+.. moduleauthor:: Nathan Derave <deravenathan@hotmail.com>
+
+This is the test module for the project's price store module.
+"""
+import datetime
+
+import pandas as pd
+
+from jaskier.price_store import MemoryMappedPriceStore
+
+
+def make_prices(symbol: str, start: str, end: str, close: float) -> pd.DataFrame:
+    dates = pd.bdate_range(start, end)
+    df_prices = pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0},
+        index=dates,
+    )
+    return pd.concat([df_prices], keys=[symbol], names=["Ticker", "Date"])
+
+
+def test_prices_are_read_back_between_dates(tmp_path):
+    """
+    Arrange: Store the prices of two symbols.
+    Act: Read them back over a narrower window.
+    Assert: Only the stored dates within the window are returned, per symbol.
+    """
+    price_store = MemoryMappedPriceStore(tmp_path)
+    price_store.append(
+        pd.concat(
+            [
+                make_prices("IWDA.AMS", "2022-01-03", "2022-01-14", 70.0),
+                make_prices("SPY", "2022-01-03", "2022-01-14", 450.0),
+            ]
+        )
+    )
+    df_prices = price_store.get_ticker_daily(
+        ["IWDA.AMS", "SPY"], datetime.date(2022, 1, 5), datetime.date(2022, 1, 7)
+    )
+    assert df_prices.loc["SPY"].index.strftime("%Y-%m-%d").tolist() == [
+        "2022-01-05",
+        "2022-01-06",
+        "2022-01-07",
+    ]
+    assert df_prices.loc["IWDA.AMS", "Close"].tolist() == [70.0] * 3
+
+
+def test_updates_only_append_new_dates(tmp_path):
+    """
+    Arrange: Store the prices of a symbol.
+    Act: Append prices overlapping the stored ones.
+    Assert: Stored prices are kept and only the later dates are appended.
+    """
+    price_store = MemoryMappedPriceStore(tmp_path)
+    price_store.append(make_prices("SPY", "2022-01-03", "2022-01-07", 450.0))
+    price_store.append(make_prices("SPY", "2022-01-06", "2022-01-11", 460.0))
+
+    df_prices = price_store.get_ticker_daily(
+        ["SPY"], datetime.date(2022, 1, 1), datetime.date(2022, 1, 31)
+    )
+    assert df_prices["Close"].tolist() == [450.0] * 5 + [460.0] * 2
+    assert price_store.get_stale_symbols(["SPY", "QQQ"], datetime.date(2022, 1, 31)) == ["QQQ"]
+    assert len(list(tmp_path.glob("*.npy"))) == 2
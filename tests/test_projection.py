@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_projection
+.. moduleauthor:: Nathan Derave <deravenathan@hotmail.com>
+
+This is the test module for the project's projection module.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from jaskier.projection import (
+    get_historical_returns,
+    project_portfolio_value,
+    simulate_paths,
+)
+
+
+def make_daily_prices(end: str, periods: int) -> pd.DataFrame:
+    dates = pd.bdate_range(end=end, periods=periods)
+    return pd.concat(
+        [
+            pd.DataFrame({"Ticker": "AAA", "Date": dates, "Close": 100.0}),
+            pd.DataFrame(
+                {"Ticker": "BBB", "Date": dates, "Close": 50.0 * 1.01 ** np.arange(periods)}
+            ),
+        ]
+    )
+
+
+def make_last_day_holdings(date: str) -> pd.DataFrame:
+    # BBB was only bought on the last day of the analysis
+    return pd.DataFrame(
+        {
+            "Date Snapshot": pd.Timestamp(date),
+            "Symbol": ["AAA", "BBB"],
+            "Ticker Share Value": [1000.0, 1000.0],
+            "Ticker Return": [0.0, 0.0],
+        }
+    )
+
+
+def test_simulated_paths_only_depend_on_seed():
+    """
+    Arrange: Draw historical daily returns.
+    Act: Simulate paths with the same seed, by chunks, with one and two workers.
+    Assert: Both simulations give the same paths, sampled every step days.
+    """
+    portfolio_returns = np.random.default_rng(0).normal(0.0005, 0.01, size=500)
+    kwargs = dict(horizon=20, n_paths=250, seed=42, step=5, chunk_size=100)
+
+    growth = simulate_paths(portfolio_returns, workers=1, **kwargs)
+    assert growth.shape == (250, 4)
+    np.testing.assert_array_equal(growth, simulate_paths(portfolio_returns, workers=2, **kwargs))
+
+
+def test_bootstrap_of_constant_returns_compounds():
+    """
+    Arrange: Build constant historical daily returns.
+    Act: Bootstrap paths from them.
+    Assert: Every path compounds the constant return.
+    """
+    growth = simulate_paths(np.full(10, 0.01), horizon=3, n_paths=5, seed=0)
+    np.testing.assert_allclose(growth, np.tile(1.01 ** np.arange(1, 4), (5, 1)), rtol=1e-6)
+
+
+def test_historical_returns_cover_the_whole_window():
+    """
+    Arrange: Download 30 days of closes, one of the symbols being held for a day only.
+    Act: Compute the historical returns of the held symbols.
+    Assert: Returns span every day of the window, whatever the holding periods.
+    """
+    returns = get_historical_returns(
+        make_daily_prices("2022-12-23", 30), pd.Index(["AAA", "BBB"])
+    )
+    assert len(returns) == 29
+    np.testing.assert_allclose(returns["BBB"], 0.01)
+
+
+def test_projection_requires_enough_returns():
+    """
+    Arrange: Download only a few days of closes.
+    Act: Project the portfolio value.
+    Assert: The lack of observations is reported.
+    """
+    with pytest.raises(ValueError, match="daily returns"):
+        project_portfolio_value(
+            make_last_day_holdings("2022-12-23"),
+            make_daily_prices("2022-12-23", 5),
+            n_paths=10,
+        )
+
+
+def test_projection_follows_trading_calendar():
+    """
+    Arrange: Hold positions up to the last trading day before Christmas.
+    Act: Project the portfolio value over 5 trading days.
+    Assert: Projected days skip the market holidays, starting from the current valuation.
+    """
+    df_bands = project_portfolio_value(
+        make_last_day_holdings("2022-12-23"),
+        make_daily_prices("2022-12-23", 30),
+        horizon=5,
+        n_paths=10,
+        seed=0,
+    )
+    assert df_bands.index.strftime("%Y-%m-%d").tolist() == [
+        "2022-12-23",
+        "2022-12-27",
+        "2022-12-28",
+        "2022-12-29",
+        "2022-12-30",
+        "2023-01-03",
+    ]
+    assert (df_bands.iloc[0] == 2000.0).all()
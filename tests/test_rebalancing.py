@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_rebalancing
+.. moduleauthor:: Nathan Derave <deravenathan@hotmail.com>
+
+This is the test module for the project's rebalancing module.
+"""
+import numpy as np
+import pandas as pd
+
+from jaskier.rebalancing import get_daily_drift, simulate_rebalancing
+
+
+def make_performances_analysis() -> pd.DataFrame:
+    """Two lots of equal value on the first day, the first symbol doubling on the third."""
+    dates = pd.to_datetime(["2022-01-03", "2022-01-04", "2022-01-05"])
+    return pd.DataFrame(
+        {
+            "Date Snapshot": np.repeat(dates, 2),
+            "Symbol": ["AAA", "BBB"] * 3,
+            "Qty": [10, 10] * 3,
+            "Adj cost": [100.0, 100.0] * 3,
+            "Symbol Adj Close": [10.0, 10.0, 10.0, 10.0, 20.0, 10.0],
+            "Adj cost daily": [100.0, 100.0, 100.0, 100.0, 200.0, 100.0],
+        }
+    )
+
+
+def test_daily_drift_from_targets():
+    """
+    Arrange: Build a per-lot daily frame and targets including a symbol not held.
+    Act: Compute the daily drift.
+    Assert: The drift is the difference between weights and targets, for every symbol.
+    """
+    targets = pd.Series({"AAA": 0.5, "BBB": 0.25, "CCC": 0.25})
+    drift = get_daily_drift(make_performances_analysis(), targets)
+    assert drift.columns.tolist() == ["AAA", "BBB", "CCC"]
+    assert np.allclose(drift.iloc[0], [0.0, 0.25, -0.25])
+    assert np.allclose(drift.iloc[-1], [2 / 3 - 0.5, 1 / 3 - 0.25, -0.25])
+
+
+def test_threshold_rebalancing_restores_targets():
+    """
+    Arrange: Build a per-lot daily frame drifting away from equal targets.
+    Act: Simulate a threshold-based rebalancing.
+    Assert: Self-financed trades restore the targets on the day the threshold is breached.
+    """
+    targets = pd.Series({"AAA": 0.5, "BBB": 0.5})
+    trades, performances = simulate_rebalancing(
+        make_performances_analysis(), targets, threshold=0.1
+    )
+    assert (trades["Date Snapshot"] == pd.Timestamp("2022-01-05")).all()
+    assert np.allclose(trades["Qty"].tolist(), [-2.5, 5.0])
+    assert np.isclose(trades["Value"].sum(), 0.0)
+    assert np.allclose(
+        performances["rebalanced_portfolio_valuation"],
+        performances["current_portfolio_valuation"],
+    )
+
+
+def test_rebalanced_holdings_are_valued_after_the_trades():
+    """
+    Arrange: Build a per-lot daily frame where the first symbol doubles then falls back.
+    Act: Simulate a threshold-based rebalancing.
+    Assert: Days following the trades are valued with the rebalanced holdings.
+    """
+    performances_analysis = pd.concat(
+        [
+            make_performances_analysis(),
+            pd.DataFrame(
+                {
+                    "Date Snapshot": pd.Timestamp("2022-01-06"),
+                    "Symbol": ["AAA", "BBB"],
+                    "Qty": [10, 10],
+                    "Adj cost": [100.0, 100.0],
+                    "Symbol Adj Close": [10.0, 10.0],
+                    "Adj cost daily": [100.0, 100.0],
+                }
+            ),
+        ]
+    )
+    targets = pd.Series({"AAA": 0.5, "BBB": 0.5})
+    trades, performances = simulate_rebalancing(
+        performances_analysis, targets, threshold=0.1
+    )
+    # 7.5 AAA and 15 BBB held after the trades of the third day
+    last_day = performances.loc["2022-01-06"]
+    assert last_day["current_portfolio_valuation"] == 200.0
+    assert np.isclose(last_day["rebalanced_portfolio_valuation"], 7.5 * 10.0 + 15 * 10.0)
+    assert np.isclose(last_day["rebalanced_roi"], 225.0 / 200.0 - 1)
+    assert trades["Date Snapshot"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2022-01-05",
+        "2022-01-05",
+        "2022-01-06",
+        "2022-01-06",
+    ]
+
+
+def test_periodic_rebalancing_never_holds_negative_quantities():
+    """
+    Arrange: Build a per-lot daily frame selling a symbol right after a monthly rebalancing.
+    Act: Simulate a monthly rebalancing.
+    Assert: The sale triggers a rebalancing, and unchanged holdings are not traded.
+    """
+    dates = pd.to_datetime(["2022-01-31", "2022-02-01", "2022-02-02", "2022-03-01"])
+    performances_analysis = pd.DataFrame(
+        {
+            "Date Snapshot": dates[[0, 0, 1, 1, 2, 3]],
+            "Symbol": ["AAA", "BBB", "AAA", "BBB", "BBB", "BBB"],
+            "Qty": [10, 10, 10, 10, 10, 10],
+            "Adj cost": [100.0] * 6,
+            "Symbol Adj Close": [10.0, 10.0, 20.0, 10.0, 10.0, 10.0],
+            "Adj cost daily": [100.0, 100.0, 200.0, 100.0, 100.0, 100.0],
+        }
+    )
+    targets = pd.Series({"AAA": 0.5, "BBB": 0.5})
+    trades, performances = simulate_rebalancing(
+        performances_analysis, targets, frequency="monthly"
+    )
+    # 7.5 AAA are held after the rebalancing of February: selling the 10 actual ones
+    # leaves the simulated portfolio short of 2.5 AAA, restored the same day
+    assert trades["Date Snapshot"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2022-02-01",
+        "2022-02-01",
+        "2022-02-02",
+        "2022-02-02",
+    ]
+    assert np.allclose(trades["Qty"].tolist(), [-2.5, 5.0, 5.0, -10.0])
+    assert np.allclose(
+        performances["rebalanced_portfolio_valuation"], [200.0, 300.0, 100.0, 100.0]
+    )
+    assert np.allclose(performances["rebalanced_roi"], [0.0, 0.5, 0.0, 0.0])